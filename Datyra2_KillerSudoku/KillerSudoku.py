@@ -1,6 +1,34 @@
-from ortools.sat.python import cp_model
+import json
+import multiprocessing
+import os
+import time
+from functools import lru_cache
+from itertools import combinations, permutations
+
+# Shembulli i cages: (shuma, [(rreshti, kolona), ...])
+DEFAULT_CAGES = [
+    (15, [(0, 0), (0, 1), (1, 0)]),
+    (15, [(0, 3), (0, 4), (1, 3)]),
+    (10, [(1, 1), (1, 2)]),
+    (14, [(2, 0), (2, 1), (3, 0)]),
+    # Shto më shumë cages sipas puzzles
+]
+
+# Cage-t me më shumë renditje të mundshme se kaq nuk marrin tabelë (AddAllowedAssignments)
+MAX_TABLE_TUPLES = 5000
+# Kufizimet innie/outie shtohen vetëm kur mbetja ka kaq qeliza ose më pak
+MAX_INNIE_CELLS = 4
+# Motori 'auto' kalon te CP-SAT kur kërkimi me maska bitësh kalon kaq nyje
+AUTO_NODE_LIMIT = 500
+
+ENGINES = ('cp_sat', 'bitmask', 'auto')
+
+
+def build_skeleton():
+    """Ndërton një herë modelin e përbashkët: fushat 9x9 dhe AddAllDifferent për rreshtat, kolonat dhe nënrrjetat."""
+    # ortools ngarkohet vetëm kur duhet, sepse importi i tij kushton më shumë se zgjidhja me maska bitësh
+    from ortools.sat.python import cp_model
 
-def solve_killer_sudoku():
     # Krijo modelin CSP
     model = cp_model.CpModel()
 
@@ -20,40 +48,504 @@ def solve_killer_sudoku():
                 for i in range(3)
                 for j in range(3)
             ])
+    return model, [[cell.Index() for cell in row] for row in grid]
 
-    # Defino grupet e "cages" dhe shumën e secilit grup
-    cages = [
-        (15, [(0, 0), (0, 1), (1, 0)]),
-        (15, [(0, 3), (0, 4), (1, 3)]),
-        (10, [(1, 1), (1, 2)]),
-        (14, [(2, 0), (2, 1), (3, 0)]),
-        # Shto më shumë cages sipas puzzles
-    ]
 
-    # Shto kufizime për shumën e secilit grup
+@lru_cache(maxsize=None)
+def shared_skeleton():
+    """Skeleti i përbashkët i procesit; çdo puzzle punon mbi një kopje (Clone), prandaj mund të ndahet."""
+    return build_skeleton()
+
+
+def parse_puzzle(data):
+    """
+    Kthen puzzle-n si fjalor {'id', 'cages', 'givens'} nga një objekt JSON, p.sh.
+    {"id": "p1", "cages": [[15, [[0, 0], [0, 1], [1, 0]]], ...], "givens": [[4, 4, 9], ...]}.
+    """
+    cages = []
+    for target_sum, cells in data.get('cages', []):
+        cells = [(int(r), int(c)) for r, c in cells]
+        if not cells or any(not (0 <= r < 9 and 0 <= c < 9) for r, c in cells):
+            raise ValueError(f"Cage me qeliza jashtë tabelës: {cells}")
+        cages.append((int(target_sum), cells))
+    givens = {}
+    for r, c, value in data.get('givens', []):
+        r, c, value = int(r), int(c), int(value)
+        if not (0 <= r < 9 and 0 <= c < 9 and 1 <= value <= 9):
+            raise ValueError(f"Vlerë e dhënë e pavlefshme: {(r, c, value)}")
+        givens[(r, c)] = value
+    return {'id': data.get('id'), 'cages': cages, 'givens': givens}
+
+
+def read_puzzles(path):
+    """Lexon puzzle-t nga një file JSON lines (një puzzle për rresht) pa i mbajtur të gjitha në memorie."""
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                puzzle = parse_puzzle(json.loads(line))
+                if puzzle['id'] is None:
+                    puzzle['id'] = line_number
+                yield puzzle
+
+
+@lru_cache(maxsize=None)
+def cage_combinations(size, target_sum):
+    """Bashkësitë e shifrave të ndryshme 1-9 me `size` elemente dhe shumë `target_sum` (të ruajtura në cache)."""
+    return tuple(digits for digits in combinations(range(1, 10), size) if sum(digits) == target_sum)
+
+
+@lru_cache(maxsize=None)
+def cage_digits(size, target_sum):
+    """Shifrat që mund të dalin në ndonjë qelizë të cage-it."""
+    return tuple(sorted({digit for digits in cage_combinations(size, target_sum) for digit in digits}))
+
+
+@lru_cache(maxsize=None)
+def cage_assignments(size, target_sum):
+    """Të gjitha renditjet e kombinimeve të vlefshme, për AddAllowedAssignments."""
+    return tuple(order for digits in cage_combinations(size, target_sum) for order in permutations(digits))
+
+
+def cage_permutation_count(size, target_sum):
+    count = len(cage_combinations(size, target_sum))
+    for factor in range(2, size + 1):
+        count *= factor
+    return count
+
+
+def cells_mask(cells):
+    """Bashkësia e qelizave si maskë bitësh me 81 bite (biti 9 * rreshti + kolona)."""
+    mask = 0
+    for r, c in cells:
+        mask |= 1 << (9 * r + c)
+    return mask
+
+
+def mask_cells(mask):
+    return [divmod(index, 9) for index in range(81) if mask >> index & 1]
+
+
+def unit_regions():
+    """Rajonet me shumë 45*k si maska: grupe rreshtash ose kolonash të njëpasnjëshme dhe nënrrjetat 3x3."""
+    regions = []
+    for length in range(1, 9):
+        for start in range(10 - length):
+            rows = range(start, start + length)
+            regions.append((length, cells_mask((r, c) for r in rows for c in range(9))))
+            regions.append((length, cells_mask((c, r) for r in rows for c in range(9))))
+    for box_row in range(3):
+        for box_col in range(3):
+            regions.append((1, cells_mask((3 * box_row + i, 3 * box_col + j) for i in range(3) for j in range(3))))
+    return tuple(regions)
+
+
+UNIT_REGIONS = unit_regions()
+
+
+def innie_outie_sums(cages):
+    """
+    Kthen kufizimet e nënkuptuara [(qelizat, shuma)] nga rregulli 45:
+    innie - qelizat e rajonit jashtë cage-ve që janë plotësisht brenda tij;
+    outie - qelizat jashtë rajonit të cage-ve që e mbulojnë atë.
+    """
+    cage_masks = [(target_sum, cells_mask(cells)) for target_sum, cells in cages]
+    covered = 0
+    for _, mask in cage_masks:
+        covered |= mask
+    implied = {}
+    for units, region in UNIT_REGIONS:
+        region_sum = 45 * units
+        inside = inside_sum = 0
+        touching = touching_sum = 0
+        for target_sum, mask in cage_masks:
+            if mask & region:
+                touching |= mask
+                touching_sum += target_sum
+                if mask & ~region == 0:
+                    inside |= mask
+                    inside_sum += target_sum
+        innies = region & ~inside
+        if inside and innies and innies.bit_count() <= MAX_INNIE_CELLS:
+            implied.setdefault(innies, region_sum - inside_sum)
+
+        # Outie ka kuptim vetëm kur e gjithë rajoni mbulohet nga cage-t
+        outies = touching & ~region
+        if region & ~covered == 0 and outies and outies.bit_count() <= MAX_INNIE_CELLS:
+            implied.setdefault(outies, touching_sum - region_sum)
+    return [(mask_cells(mask), target_sum) for mask, target_sum in implied.items()]
+
+
+def add_cage_constraints(model, grid, cages, cage_tables=True):
+    """
+    Shton shumat e cage-ve. Me cage_tables, çdo cage merr gjithashtu AllDifferent, domenet e reduktuara nga
+    tabela e kombinimeve, AddAllowedAssignments kur tabela është e vogël, dhe shumat innie/outie.
+    """
+    from ortools.sat.python import cp_model
+
     for target_sum, cells in cages:
-        model.Add(sum(grid[r][c] for r, c in cells) == target_sum)
+        variables = [grid[r][c] for r, c in cells]
+        model.Add(sum(variables) == target_sum)
+        if not cage_tables:
+            continue
+        size = len(cells)
+        if size > 1:
+            model.AddAllDifferent(variables)
+        domain = cp_model.Domain.FromValues(cage_digits(size, target_sum))
+        for cell in variables:
+            model.AddLinearExpressionInDomain(cell, domain)
+        if 1 < size and cage_permutation_count(size, target_sum) <= MAX_TABLE_TUPLES:
+            model.AddAllowedAssignments(variables, cage_assignments(size, target_sum))
+
+    if cage_tables:
+        for cells, target_sum in innie_outie_sums(cages):
+            model.Add(sum(grid[r][c] for r, c in cells) == target_sum)
+
+
+def solve_cp_sat(puzzle, skeleton=None, workers=1, time_limit=None, cage_tables=True):
+    """Zgjidh një puzzle me CP-SAT mbi një kopje të skeletit."""
+    from ortools.sat.python import cp_model
+
+    base_model, cell_indices = skeleton or shared_skeleton()
+    model = base_model.Clone()
+    grid = [[model.GetIntVarFromProtoIndex(index) for index in row] for row in cell_indices]
+
+    # Shto kufizime për shumën e secilit grup
+    add_cage_constraints(model, grid, puzzle['cages'], cage_tables)
+    for (r, c), value in puzzle.get('givens', {}).items():
+        model.Add(grid[r][c] == value)
 
-    # Zgjidh modelin
     solver = cp_model.CpSolver()
+    solver.parameters.num_workers = workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
     status = solver.Solve(model)
 
-    # Shfaq zgjidhjen nëse është gjetur
+    solution = None
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        values = solver.ResponseProto().solution
+        solution = [[values[index] for index in row] for row in cell_indices]
+    return {
+        'id': puzzle.get('id'),
+        'engine': 'cp_sat',
+        'status': solver.StatusName(status),
+        'grid': solution,
+        'wall_time': solver.WallTime(),
+        'branches': solver.NumBranches(),
+        'conflicts': solver.NumConflicts(),
+    }
+
+
+# Motori pa varësi: shifra d ruhet si biti 1 << d, kështu që maskat e rreshtave, kolonave, nënrrjetave
+# dhe cage-ve tregojnë shifrat e zëna, ndërsa kandidatët e një qelize janë maska e shifrave të lira.
+ALL_DIGITS = 0b1111111110
+ROW_OF = tuple(cell // 9 for cell in range(81))
+COL_OF = tuple(cell % 9 for cell in range(81))
+BOX_OF = tuple(3 * (cell // 27) + cell % 9 // 3 for cell in range(81))
+UNIT_CELLS = (
+    tuple(tuple(cell for cell in range(81) if ROW_OF[cell] == unit) for unit in range(9))
+    + tuple(tuple(cell for cell in range(81) if COL_OF[cell] == unit) for unit in range(9))
+    + tuple(tuple(cell for cell in range(81) if BOX_OF[cell] == unit) for unit in range(9))
+)
+
+
+class SearchLimitReached(Exception):
+    """Kërkimi me maska bitësh kaloi kufirin e nyjeve ose të kohës."""
+
+
+@lru_cache(maxsize=None)
+def cage_candidates(empty, remaining_sum, available):
+    """Maska e shifrave që mund të vendosen në cage me `empty` qeliza bosh, shumë të mbetur dhe shifra të lira."""
+    candidates = 0
+    for digits in cage_combinations(empty, remaining_sum):
+        mask = 0
+        for digit in digits:
+            mask |= 1 << digit
+        if mask & ~available == 0:
+            candidates |= mask
+    return candidates
+
+
+@lru_cache(maxsize=None)
+def cage_required(empty, remaining_sum, available):
+    """Maska e shifrave që dalin në çdo kombinim të mundshëm të cage-it, pra duhet të vendosen patjetër."""
+    required = ALL_DIGITS
+    for digits in cage_combinations(empty, remaining_sum):
+        mask = 0
+        for digit in digits:
+            mask |= 1 << digit
+        if mask & ~available == 0:
+            required &= mask
+    return required
+
+
+def solve_bitmask_grid(cages, givens=None, max_nodes=None, stats=None, time_limit=None):
+    """
+    Kërkim me kthim mbrapa (backtracking) me maska bitësh: zgjedh qelizën me më pak kandidatë (MRV) dhe
+    i pret kandidatët me tabelën e kombinimeve të cage-it. Kthen tabelën 9x9 ose None kur nuk ka zgjidhje;
+    ngre SearchLimitReached kur kalon max_nodes nyje ose time_limit sekonda.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    # Qelizat jashtë cage-ve marrin një cage të rremë (indeksi len(cages)) me të gjitha shifrat të lejuara
+    free_cage = len(cages)
+    cage_of = [free_cage] * 81
+    remaining_sum = []
+    empty_count = []
+    used = []
+    for index, (target_sum, cells) in enumerate(cages):
+        for r, c in cells:
+            if cage_of[9 * r + c] != free_cage:
+                raise ValueError(f"Qeliza {(r, c)} është në më shumë se një cage")
+            cage_of[9 * r + c] = index
+        remaining_sum.append(target_sum)
+        empty_count.append(len(cells))
+        used.append(0)
+    # Kandidatët e secilit cage rillogariten vetëm kur ndryshon vetë cage-i
+    cage_masks = [cage_candidates(empty_count[cage], remaining_sum[cage], ALL_DIGITS) for cage in range(free_cage)]
+    cage_masks.append(ALL_DIGITS)
+    cage_cells = [[9 * r + c for r, c in cells] for _, cells in cages]
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    values = [0] * 81
+    counters = {'nodes': 0, 'backtracks': 0}
+
+    def candidates(cell):
+        return (ALL_DIGITS & ~(rows[ROW_OF[cell]] | cols[COL_OF[cell]] | boxes[BOX_OF[cell]])
+                & cage_masks[cage_of[cell]])
+
+    def place(cell, digit):
+        bit = 1 << digit
+        rows[ROW_OF[cell]] |= bit
+        cols[COL_OF[cell]] |= bit
+        boxes[BOX_OF[cell]] |= bit
+        values[cell] = digit
+        cage = cage_of[cell]
+        if cage != free_cage:
+            used[cage] |= bit
+            remaining_sum[cage] -= digit
+            empty_count[cage] -= 1
+            cage_masks[cage] = cage_candidates(empty_count[cage], remaining_sum[cage], ALL_DIGITS & ~used[cage])
+
+    def remove(cell, digit):
+        bit = 1 << digit
+        rows[ROW_OF[cell]] ^= bit
+        cols[COL_OF[cell]] ^= bit
+        boxes[BOX_OF[cell]] ^= bit
+        values[cell] = 0
+        cage = cage_of[cell]
+        if cage != free_cage:
+            used[cage] ^= bit
+            remaining_sum[cage] += digit
+            empty_count[cage] += 1
+            cage_masks[cage] = cage_candidates(empty_count[cage], remaining_sum[cage], ALL_DIGITS & ~used[cage])
+
+    def choose(empty):
+        """
+        Kthen (indeksi në empty, maska e kandidatëve) për qelizën e radhës, ose None kur gjendja është e pazgjidhshme.
+        MRV plotësohet me "hidden singles": një shifër që në rresht, kolonë, nënrrjetë ose cage ka vetëm
+        një qelizë të mundshme vendoset direkt aty.
+        """
+        masks = [0] * 81
+        best_index, best_mask, best_count = 0, 0, 10
+        for index, cell in enumerate(empty):
+            mask = (ALL_DIGITS & ~(rows[ROW_OF[cell]] | cols[COL_OF[cell]] | boxes[BOX_OF[cell]])
+                    & cage_masks[cage_of[cell]])
+            count = mask.bit_count()
+            if count == 0:
+                return None
+            masks[cell] = mask
+            if count < best_count:
+                best_index, best_mask, best_count = index, mask, count
+        if best_count == 1:
+            return best_index, best_mask
+
+        units = [(UNIT_CELLS[unit], ALL_DIGITS & ~(rows[unit] if unit < 9 else cols[unit - 9] if unit < 18
+                                                   else boxes[unit - 18])) for unit in range(27)]
+        for cage, cells in enumerate(cage_cells):
+            if empty_count[cage]:
+                needed = cage_required(empty_count[cage], remaining_sum[cage], ALL_DIGITS & ~used[cage])
+                units.append((cells, needed))
+        for cells, needed in units:
+            once = twice = 0
+            for cell in cells:
+                mask = masks[cell]
+                twice |= once & mask
+                once |= mask
+            if needed & ~once:
+                return None
+            singles = needed & once & ~twice
+            if singles:
+                bit = singles & -singles
+                for cell in cells:
+                    if masks[cell] & bit:
+                        return empty.index(cell), bit
+        return best_index, best_mask
+
+    def search(empty):
+        if not empty:
+            return True
+        counters['nodes'] += 1
+        if max_nodes is not None and counters['nodes'] > max_nodes:
+            raise SearchLimitReached
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchLimitReached
+        choice = choose(empty)
+        if choice is None:
+            counters['backtracks'] += 1
+            return False
+        best_index, best_mask = choice
+
+        empty[best_index], empty[-1] = empty[-1], empty[best_index]
+        cell = empty.pop()
+        mask = best_mask
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            digit = bit.bit_length() - 1
+            place(cell, digit)
+            if search(empty):
+                return True
+            remove(cell, digit)
+        empty.append(cell)
+        empty[best_index], empty[-1] = empty[-1], empty[best_index]
+        return False
+
+    try:
+        solved = True
+        for (r, c), digit in (givens or {}).items():
+            cell = 9 * r + c
+            if values[cell] or not candidates(cell) >> digit & 1:
+                solved = False
+                break
+            place(cell, digit)
+        if solved:
+            solved = search([cell for cell in range(81) if not values[cell]])
+    finally:
+        if stats is not None:
+            stats.update(counters)
+    if not solved:
+        return None
+    return [values[9 * r:9 * r + 9] for r in range(9)]
+
+
+def solve_bitmask(puzzle, max_nodes=None, time_limit=None):
+    """
+    Zgjidh një puzzle me motorin pa varësi; kthen rezultatin në të njëjtën formë si solve_cp_sat,
+    me status 'UNKNOWN' kur mbaron kufiri i nyjeve ose i kohës.
+    """
+    stats = {}
+    start = time.perf_counter()
+    try:
+        grid = solve_bitmask_grid(puzzle['cages'], puzzle.get('givens'), max_nodes, stats, time_limit)
+        status = 'OPTIMAL' if grid is not None else 'INFEASIBLE'
+    except SearchLimitReached:
+        grid, status = None, 'UNKNOWN'
+    return {
+        'id': puzzle.get('id'),
+        'engine': 'bitmask',
+        'status': status,
+        'grid': grid,
+        'wall_time': time.perf_counter() - start,
+        'branches': stats['nodes'],
+        'conflicts': stats['backtracks'],
+    }
+
+
+def solve_puzzle(puzzle, skeleton=None, workers=1, time_limit=None, cage_tables=True, engine='cp_sat'):
+    """
+    Zgjidh një puzzle dhe kthen rezultatin si fjalor:
+    'id', 'engine', 'status', 'grid' (9x9 ose None), 'wall_time', 'branches', 'conflicts'.
+    engine: 'cp_sat', 'bitmask' (pa ortools) ose 'auto' (bitmask deri në AUTO_NODE_LIMIT nyje, pastaj CP-SAT).
+    time_limit vlen për çdo motor; te 'auto' CP-SAT merr vetëm kohën që mbetet pas kërkimit me maska bitësh.
+    """
+    if engine == 'bitmask':
+        return solve_bitmask(puzzle, time_limit=time_limit)
+    if engine == 'auto':
+        result = solve_bitmask(puzzle, AUTO_NODE_LIMIT, time_limit)
+        if result['status'] != 'UNKNOWN':
+            return result
+        if time_limit is not None:
+            time_limit -= result['wall_time']
+            if time_limit <= 0:
+                return result
+    elif engine != 'cp_sat':
+        raise ValueError(f"Motor i panjohur: {engine!r}")
+    return solve_cp_sat(puzzle, skeleton, workers, time_limit, cage_tables)
+
+
+# Modaliteti me procese: çdo proces ndërton skeletin e vet një herë (shared_skeleton) dhe e kopjon për çdo puzzle
+worker_options = {}
+
+
+def init_worker(workers, time_limit, cage_tables, engine):
+    global worker_options
+    worker_options = {'workers': workers, 'time_limit': time_limit, 'cage_tables': cage_tables, 'engine': engine}
+
+
+def solve_puzzle_task(puzzle):
+    return solve_puzzle(puzzle, **worker_options)
+
+
+def solve_puzzles(puzzles, workers=1, time_limit=None, processes=None, chunksize=16, cage_tables=True,
+                  engine='cp_sat'):
+    """
+    Zgjidh puzzle-t (listë ose iterator) dhe gjeneron rezultatet me të njëjtën radhë.
+    workers: thread-et e CP-SAT për puzzle; time_limit: sekonda për puzzle;
+    processes: nëse jepet (> 1), puzzle-t ndahen në një pool procesesh;
+    cage_tables: përdor tabelat e kombinimeve dhe kufizimet innie/outie;
+    engine: motori i zgjidhjes (shih solve_puzzle).
+    """
+    if processes is None or processes <= 1:
+        for puzzle in puzzles:
+            yield solve_puzzle(puzzle, None, workers, time_limit, cage_tables, engine)
+        return
+    initargs = (workers, time_limit, cage_tables, engine)
+    with multiprocessing.Pool(processes, initializer=init_worker, initargs=initargs) as pool:
+        yield from pool.imap(solve_puzzle_task, puzzles, chunksize)
+
+
+def print_grid(grid):
+    """Shfaq zgjidhjen me kufijtë e nënrrjetave."""
+    for i in range(9):
+        row = ""
+        for j in range(9):
+            # Shto numrin dhe kufijtë vertikalë
+            row += f" {grid[i][j]} "
+            if (j + 1) % 3 == 0 and j < 8:
+                row += "|"
+        print(row)
+        # Shto kufijtë horizontalë pas çdo 3 rreshtash
+        if (i + 1) % 3 == 0 and i < 8:
+            print("-" * 28)
+
+
+def solve_killer_sudoku(cages=DEFAULT_CAGES, engine='cp_sat'):
+    result = solve_puzzle({'id': None, 'cages': cages, 'givens': {}}, engine=engine)
+
+    # Shfaq zgjidhjen nëse është gjetur
+    if result['grid'] is not None:
         print("Zgjidhja e Sudoku-t:")
-        for i in range(9):
-            row = ""
-            for j in range(9):
-                # Shto numrin dhe kufijtë vertikalë
-                row += f" {solver.Value(grid[i][j])} "
-                if (j + 1) % 3 == 0 and j < 8:
-                    row += "|"
-            print(row)
-            # Shto kufijtë horizontalë pas çdo 3 rreshtash
-            if (i + 1) % 3 == 0 and i < 8:
-                print("-" * 28)
+        print_grid(result['grid'])
     else:
         print("Nuk u gjet një zgjidhje.")
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
 
-# Thirr funksionin për të zgjidhur puzzle-n
-solve_killer_sudoku()
+    parser = argparse.ArgumentParser(description="Zgjidh puzzle Killer Sudoku me CP-SAT.")
+    parser.add_argument('puzzles', nargs='?', help="file JSON lines me puzzle; pa të zgjidhet shembulli")
+    parser.add_argument('--workers', type=int, default=1, help="thread-et e CP-SAT për puzzle")
+    parser.add_argument('--time-limit', type=float, help="sekonda për puzzle, për çdo motor")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help="procese për file-t me shumë puzzle")
+    parser.add_argument('--no-cage-tables', action='store_true', help="vetëm shumat e cage-ve, pa tabela dhe innie/outie")
+    parser.add_argument('--engine', choices=ENGINES, default='cp_sat', help="motori i zgjidhjes; --time-limit vlen edhe për 'bitmask' (status UNKNOWN kur mbaron koha)")
+    args = parser.parse_args()
+
+    if args.puzzles is None:
+        # Thirr funksionin për të zgjidhur puzzle-n
+        solve_killer_sudoku(engine=args.engine)
+    else:
+        for result in solve_puzzles(read_puzzles(args.puzzles), args.workers, args.time_limit, args.processes,
+                                    cage_tables=not args.no_cage_tables, engine=args.engine):
+            print(json.dumps(result))
@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import KillerSudoku
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Procesi i ri mat gjithë koston e një worker-i jetëshkurtër: nisjen e Python, importet dhe zgjidhjen e parë
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import KillerSudoku
+result = KillerSudoku.solve_puzzle(KillerSudoku.parse_puzzle(json.loads(sys.argv[1])), engine=sys.argv[2])
+print(json.dumps({'status': result['status'], 'seconds': time.perf_counter() - start}))
+"""
+
+
+def solved_grid(rng):
+    """Një tabelë Sudoku e plotë e rastësishme: modeli bazë me shifra, rreshta dhe kolona të përziera."""
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    rows = [3 * band + r for band in rng.sample(range(3), 3) for r in rng.sample(range(3), 3)]
+    cols = [3 * stack + c for stack in rng.sample(range(3), 3) for c in rng.sample(range(3), 3)]
+    return [[digits[(3 * (r % 3) + r // 3 + c) % 9] for c in cols] for r in rows]
+
+
+def random_cages(grid, rng, max_cage_size):
+    """Ndan tabelën në cage të lidhura me shifra të ndryshme dhe shumat nga zgjidhja."""
+    free = {(r, c) for r in range(9) for c in range(9)}
+    cages = []
+    while free:
+        cell = rng.choice(sorted(free))
+        free.discard(cell)
+        cells, digits = [cell], {grid[cell[0]][cell[1]]}
+        size = rng.randint(1, max_cage_size)
+        while len(cells) < size:
+            neighbours = [(r + dr, c + dc) for r, c in cells for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                          if (r + dr, c + dc) in free and grid[r + dr][c + dc] not in digits]
+            if not neighbours:
+                break
+            cell = rng.choice(neighbours)
+            free.discard(cell)
+            cells.append(cell)
+            digits.add(grid[cell[0]][cell[1]])
+        cages.append([sum(grid[r][c] for r, c in cells), [list(cell) for cell in cells]])
+    return cages
+
+
+def generate_puzzles(count, max_cage_size=4, seed=0):
+    """Puzzle të përsëritshme në formatin JSON të read_puzzles (pa vlera të dhëna)."""
+    rng = random.Random(seed)
+    return [{'id': index, 'cages': random_cages(solved_grid(rng), rng, max_cage_size)} for index in range(count)]
+
+
+def measure_startup(engine, puzzle, runs):
+    """Koha (sekonda) e një procesi të ri që importon modulin dhe zgjidh një puzzle."""
+    wall_times, solve_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, json.dumps(puzzle), engine],
+                                cwd=MODULE_DIR, capture_output=True, text=True, check=True).stdout
+        wall_times.append(time.perf_counter() - start)
+        solve_times.append(json.loads(output)['seconds'])
+    return {'process_seconds': min(wall_times), 'import_and_solve_seconds': min(solve_times)}
+
+
+def measure_latency(engine, puzzles):
+    """Vonesa për puzzle brenda një procesi të ngrohur; për 'auto' numërohen edhe kalimet te CP-SAT."""
+    KillerSudoku.solve_puzzle(puzzles[0], engine=engine)
+    latencies, fallbacks, unsolved = [], 0, 0
+    for puzzle in puzzles:
+        start = time.perf_counter()
+        result = KillerSudoku.solve_puzzle(puzzle, engine=engine)
+        latencies.append(time.perf_counter() - start)
+        fallbacks += engine == 'auto' and result['engine'] == 'cp_sat'
+        unsolved += result['grid'] is None
+    latencies.sort()
+    return {
+        'mean_ms': 1000 * statistics.mean(latencies),
+        'median_ms': 1000 * statistics.median(latencies),
+        'p95_ms': 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        'max_ms': 1000 * latencies[-1],
+        'fallbacks': fallbacks,
+        'unsolved': unsolved,
+    }
+
+
+def run_benchmark(raw_puzzles, engines, startup_runs=3):
+    puzzles = [KillerSudoku.parse_puzzle(raw) for raw in raw_puzzles]
+    results = []
+    for engine in engines:
+        row = {'engine': engine}
+        if startup_runs:
+            row.update(measure_startup(engine, raw_puzzles[0], startup_runs))
+        row.update(measure_latency(engine, puzzles))
+        results.append(row)
+    return results
+
+
+def print_table(title, rows, columns):
+    print(title)
+    widths = [max(len(column), 10) for column in columns]
+    print("  ".join(f"{column:>{width}}" for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(f"{row[column]:>{width}.3f}" if isinstance(row.get(column), float)
+                        else f"{str(row.get(column)):>{width}}" for column, width in zip(columns, widths)))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Krahason motorët e Killer Sudoku: kohën e nisjes dhe vonesën për puzzle.")
+    parser.add_argument('--puzzles', type=int, default=100, help="numri i puzzle-ve të gjeneruara")
+    parser.add_argument('--max-cage-size', type=int, default=4, help="madhësia maksimale e cage-ve të gjeneruara")
+    parser.add_argument('--file', help="përdor puzzle-t nga një file JSON lines në vend të gjenerimit")
+    parser.add_argument('--engines', nargs='+', choices=KillerSudoku.ENGINES, default=list(KillerSudoku.ENGINES))
+    parser.add_argument('--startup-runs', type=int, default=3, help="procese të reja për matjen e nisjes (0 e çaktivizon)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="shkruaj rezultatet si JSON në PATH ('-' për stdout)")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file) as f:
+            raw_puzzles = [json.loads(line) for line in f if line.strip() and not line.startswith('#')]
+    else:
+        raw_puzzles = generate_puzzles(args.puzzles, args.max_cage_size, args.seed)
+
+    results = run_benchmark(raw_puzzles, args.engines, args.startup_runs)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'arguments': vars(args),
+        'results': results,
+    }
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return report
+
+    columns = ['engine', 'mean_ms', 'median_ms', 'p95_ms', 'max_ms', 'fallbacks', 'unsolved']
+    if args.startup_runs:
+        columns[1:1] = ['process_seconds', 'import_and_solve_seconds']
+    print_table(f"Killer Sudoku ({len(raw_puzzles)} puzzle):", results, columns)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
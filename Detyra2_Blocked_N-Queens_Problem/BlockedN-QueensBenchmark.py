@@ -0,0 +1,189 @@
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Emri i skedarit ka vize, prandaj moduli ngarkohet nga shtegu
+MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BlockedN-QueensProblem.py")
+spec = importlib.util.spec_from_file_location("BlockedNQueensProblem", MODULE_PATH)
+nqueens = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = nqueens
+spec.loader.exec_module(nqueens)
+
+HEURISTICS = {
+    'heuristic_1': nqueens.heuristic_1,
+    'heuristic_2': nqueens.heuristic_2,
+    'heuristic_3': nqueens.heuristic_3,
+    'heuristic_4': nqueens.heuristic_4,
+    'combined_heuristic': nqueens.combined_heuristic,
+    'admissible_combined_heuristic': nqueens.admissible_combined_heuristic,
+}
+
+# Min-conflicts nuk perdor heuristike, prandaj ekzekutohet nje here per instance
+MODES_WITHOUT_HEURISTIC = {'min_conflicts'}
+
+FIELDS = ['N', 'density', 'instance', 'blocked', 'mode', 'heuristic', 'solved', 'limit_reached',
+          'nodes_expanded', 'nodes_generated', 'peak_frontier', 'seconds', 'peak_memory_kb']
+
+
+def generate_instances(sizes, densities, count, seed=0):
+    """ Gjeneron instanca te perseritshme: cdo (N, dendesia, indeksi) ka gjeneratorin e vet te rastesishem """
+    instances = []
+    for N in sizes:
+        for density in densities:
+            for index in range(count):
+                rng = random.Random(f"{seed}:{N}:{density}:{index}")
+                cells = [(row, col) for row in range(N) for col in range(N)]
+                blocked_cells = set(rng.sample(cells, round(density * N * N)))
+                instances.append({'N': N, 'density': density, 'instance': index, 'blocked_cells': blocked_cells})
+    return instances
+
+
+def run_case(instance, mode, heuristic_name, max_expansions, time_limit, measure_memory, seed):
+    """ Ekzekuton nje kerkim dhe kthen rreshtin e rezultateve """
+    N = instance['N']
+    blocked_cells = instance['blocked_cells']
+    heuristic = HEURISTICS.get(heuristic_name)
+    options = {} if mode in MODES_WITHOUT_HEURISTIC else {'max_expansions': max_expansions}
+    if mode == 'min_conflicts':
+        options.update(seed=seed, time_limit=time_limit)
+
+    # heuristic_4 perdor random, prandaj gjeneratori rivendoset para cdo ekzekutimi
+    random.seed(seed)
+    stats = {}
+    start = time.perf_counter()
+    solution = nqueens.solve_n_queens(N, blocked_cells, heuristic, mode=mode, stats=stats, **options)
+    elapsed = time.perf_counter() - start
+
+    # Memoria matet ne nje ekzekutim te dyte qe tracemalloc te mos ndikoje ne kohe
+    peak_memory_kb = None
+    if measure_memory:
+        random.seed(seed)
+        tracemalloc.start()
+        try:
+            nqueens.solve_n_queens(N, blocked_cells, heuristic, mode=mode, **options)
+            peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'N': N,
+        'density': instance['density'],
+        'instance': instance['instance'],
+        'blocked': len(blocked_cells),
+        'mode': mode,
+        'heuristic': heuristic_name,
+        'solved': solution is not None,
+        'limit_reached': stats.get('limit_reached', False),
+        'nodes_expanded': stats.get('nodes_expanded', stats.get('steps')),
+        'nodes_generated': stats.get('nodes_generated'),
+        'peak_frontier': stats.get('peak_frontier'),
+        'seconds': elapsed,
+        'peak_memory_kb': peak_memory_kb,
+    }
+
+
+def run_benchmark(instances, modes, heuristic_names, max_expansions=20000, time_limit=1.0, measure_memory=True, seed=0):
+    """ Ekzekuton cdo menyre kerkimi me cdo heuristike ne te gjitha instancat """
+    results = []
+    for instance in instances:
+        for mode in modes:
+            names = ['-'] if mode in MODES_WITHOUT_HEURISTIC else heuristic_names
+            for heuristic_name in names:
+                results.append(run_case(instance, mode, heuristic_name, max_expansions, time_limit, measure_memory, seed))
+    return results
+
+
+def summarize(results):
+    """ Mesataret per (menyre, heuristike) mbi te gjitha instancat """
+    groups = {}
+    for row in results:
+        groups.setdefault((row['mode'], row['heuristic']), []).append(row)
+    summary = []
+    for (mode, heuristic_name), rows in groups.items():
+        def mean(field):
+            values = [row[field] for row in rows if row[field] is not None]
+            return sum(values) / len(values) if values else None
+        summary.append({
+            'mode': mode,
+            'heuristic': heuristic_name,
+            'runs': len(rows),
+            'solved': sum(row['solved'] for row in rows),
+            'nodes_expanded': mean('nodes_expanded'),
+            'peak_frontier': mean('peak_frontier'),
+            'seconds': mean('seconds'),
+            'peak_memory_kb': mean('peak_memory_kb'),
+        })
+    return summary
+
+
+def print_table(title, rows, columns):
+    print(title)
+    print("  ".join(f"{column:>30}" if column == 'heuristic' else f"{column:>14}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            width = 30 if column == 'heuristic' else 14
+            cells.append(f"{value:>{width}.3f}" if isinstance(value, float) else f"{str(value):>{width}}")
+        print("  ".join(cells))
+    print()
+
+
+def write_csv(path, results):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark i heuristikave dhe menyrave te kerkimit per Blocked N-Queens.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[6, 8, 10])
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.0, 0.1])
+    parser.add_argument('--instances', type=int, default=2, help="instanca per cdo (N, dendesi)")
+    parser.add_argument('--modes', nargs='+', choices=sorted(nqueens.SEARCH_MODES), default=list(nqueens.SEARCH_MODES))
+    parser.add_argument('--heuristics', nargs='+', choices=list(HEURISTICS), default=list(HEURISTICS))
+    parser.add_argument('--max-expansions', type=int, default=20000, help="kufiri i nyjeve te zgjeruara per kerkim")
+    parser.add_argument('--time-limit', type=float, default=1.0, help="koha maksimale (sekonda) per min-conflicts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="mos mat memorien me tracemalloc")
+    parser.add_argument('--csv', metavar='PATH', help="shkruaj rezultatet si CSV ne PATH")
+    parser.add_argument('--json', metavar='PATH', help="shkruaj rezultatet si JSON ne PATH ('-' per stdout)")
+    args = parser.parse_args(argv)
+
+    instances = generate_instances(args.sizes, args.densities, args.instances, args.seed)
+    results = run_benchmark(instances, args.modes, args.heuristics, args.max_expansions, args.time_limit,
+                            not args.no_memory, args.seed)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'arguments': vars(args),
+        'results': results,
+        'summary': summarize(results),
+    }
+
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return report
+
+    print_table("Permbledhje:", report['summary'],
+                ['mode', 'heuristic', 'runs', 'solved', 'nodes_expanded', 'peak_frontier', 'seconds', 'peak_memory_kb'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
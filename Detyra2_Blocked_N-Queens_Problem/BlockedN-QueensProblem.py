@@ -1,38 +1,354 @@
 import heapq
+import multiprocessing
+import os
 import random
+import time
+from collections import OrderedDict
 
-def is_safe(board, row, col, N):
-    """ Kontrollon nese vendosja e mbretereshes ne (row, col) eshte e sigurte """
-    for i in range(row):
-        if board[i] == col or \
-           board[i] - i == col - row or \
-           board[i] + i == col + row:
-            return False
-    return True
-
-def a_star_n_queens(N, blocked_cells, heuristic):
-    """ Zgjidh problemin Blocked N-Queens duke perdorur algoritmin A* """
-    def h(state):
-        return heuristic(state, N, blocked_cells)
-
-    open_list = []  # Priority queue me heapq
-    heapq.heappush(open_list, (0, [], 0))  # (priority, gjendja, g(n))
-
-    while open_list:
-        priority, state, g = heapq.heappop(open_list)
+def blocked_row_masks(N, blocked_cells):
+    """ Kthen qelizat e bllokuara si maske bitesh per secilin rresht (biti col per kolonen col) """
+    masks = [0] * N
+    for row, col in blocked_cells:
+        if 0 <= row < N and 0 <= col < N:
+            masks[row] |= 1 << col
+    return masks
 
-        # Nese kemi vendosur te gjitha mbretereshat, kthe rezultatin
-        if len(state) == N:
-            return state
+def unpack_state(packed, row_count, N):
+    """ Kthen listen e kolonave per rreshtat e pare row_count nga gjendja e paketuar """
+    width = N.bit_length()
+    mask = (1 << width) - 1
+    return [((packed >> (width * (N - 1 - row))) & mask) - 1 for row in range(row_count)]
 
-        # Provo te vendosesh mbreteresha ne rreshtin aktual
+def a_star_n_queens(N, blocked_cells, heuristic, stats=None, max_expansions=None):
+    """ Zgjidh problemin Blocked N-Queens duke perdorur algoritmin A* """
+    expander = NodeExpander(N, blocked_cells, heuristic, max_expansions)
+
+    # Nyjet jane (f(n), gjendja e paketuar, g(n), kolonat, diag. djathtas, diag. majtas, qelizat e lira);
+    # gjendja e paketuar krahasohet si lista origjinale, keshtu qe rendi ne heap mbetet i njejte
+    open_list = [expander.root()]  # Priority queue me heapq
+    peak_frontier = 1
+
+    try:
+        while open_list:
+            node = heapq.heappop(open_list)
+
+            # Nese kemi vendosur te gjitha mbretereshat, kthe rezultatin
+            if node[2] == N:
+                return expander.solution(node)
+
+            # Provo te vendosesh mbreteresha ne kolonat e lira te rreshtit aktual
+            for child in expander.children(node):
+                heapq.heappush(open_list, child)
+            peak_frontier = max(peak_frontier, len(open_list))
+
+        return None
+    except SearchLimitReached:
+        return None
+    finally:
+        expander.report(stats, peak_frontier)
+
+def ida_star_n_queens(N, blocked_cells, heuristic, stats=None, max_expansions=None):
+    """ Zgjidh problemin me IDA*: kerkim ne thellesi me kufi f(n) qe rritet, me memorie lineare ne N """
+    # Cdo iteracion i rikalon nyjet e meparshme, prandaj vetem ketu heuristikat memorizohen
+    expander = NodeExpander(N, blocked_cells, heuristic, max_expansions, memoize=True)
+    root = expander.root()
+    threshold = root[0]
+    peak_frontier = 1
+
+    try:
+        while True:
+            next_threshold = float('inf')
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                if node[0] > threshold:
+                    next_threshold = min(next_threshold, node[0])
+                    continue
+                if node[2] == N:
+                    return expander.solution(node)
+                # Femijet me f(n) me te vogel dalin te paret nga stiva, si ne A*
+                stack.extend(sorted(expander.children(node), reverse=True))
+                peak_frontier = max(peak_frontier, len(stack))
+
+            # Asnje nyje nuk u pre nga kufiri: e gjithe pema u kerkua pa zgjidhje
+            if next_threshold == float('inf'):
+                return None
+            threshold = next_threshold
+    except SearchLimitReached:
+        return None
+    finally:
+        expander.report(stats, peak_frontier)
+
+def beam_search_n_queens(N, blocked_cells, heuristic, stats=None, beam_width=64, max_expansions=None):
+    """ Zgjidh problemin me beam search: ruan vetem beam_width nyjet me te mira per cdo rresht (jo i plote) """
+    expander = NodeExpander(N, blocked_cells, heuristic, max_expansions)
+    beam = [expander.root()]
+    peak_frontier = 1
+
+    try:
+        for _ in range(N):
+            # nsmallest mban vetem beam_width kandidate ne memorie
+            beam = heapq.nsmallest(beam_width, (child for node in beam for child in expander.children(node)))
+            if not beam:
+                return None
+            peak_frontier = max(peak_frontier, len(beam))
+        return expander.solution(beam[0])
+    except SearchLimitReached:
+        return None
+    finally:
+        expander.report(stats, peak_frontier)
+
+def min_conflicts_n_queens(N, blocked_cells, heuristic=None, stats=None, time_limit=10.0, max_steps=None, seed=None):
+    """
+    Zgjidh problemin per N te medha me kerkim lokal min-conflicts (heuristic nuk perdoret).
+    Mbreteresha e nje rreshti me konflikte zhvendoset ne kolonen e pabllokuar me me pak konflikte;
+    pas max_steps hapash fillohet nga e para, deri sa te mbaroje time_limit. Kthen None nese nuk gjendet zgjidhje.
+    """
+    rng = random.Random(seed)
+    blocked_rows = blocked_row_masks(N, blocked_cells)
+    if max_steps is None:
+        max_steps = 2 * N + 100
+    deadline = time.perf_counter() + time_limit
+    restarts = 0
+    steps = 0
+
+    try:
+        while time.perf_counter() < deadline:
+            # Numeruesit e konflikteve per kolone dhe per te dy diagonalet (r - c + N - 1 dhe r + c)
+            col_count = [0] * N
+            right_diagonals = [0] * (2 * N - 1)
+            left_diagonals = [0] * (2 * N - 1)
+
+            # Vendosja fillestare: permutacion i kolonave, ku per cdo rresht provohen disa kolona te mbetura
+            # te rastesishme dhe merret e para pa konflikt diagonal
+            solution = list(range(N))
+            rng.shuffle(solution)
+            for row in range(N):
+                chosen = None
+                for _ in range(32):
+                    j = rng.randrange(row, N)
+                    col = solution[j]
+                    if blocked_rows[row] >> col & 1:
+                        continue
+                    chosen = j
+                    if right_diagonals[row - col + N - 1] == 0 and left_diagonals[row + col] == 0:
+                        break
+                if chosen is not None:
+                    solution[row], solution[chosen] = solution[chosen], solution[row]
+                col = solution[row]
+                col_count[col] += 1
+                right_diagonals[row - col + N - 1] += 1
+                left_diagonals[row + col] += 1
+
+            def conflicts(row, col):
+                """ Numri i mbretereshave te tjera qe sulmojne (row, col) """
+                own = 3 if solution[row] == col else 0
+                return col_count[col] + right_diagonals[row - col + N - 1] + left_diagonals[row + col] - own
+
+            def in_conflict(row):
+                return conflicts(row, solution[row]) > 0 or blocked_rows[row] >> solution[row] & 1
+
+            candidates = [row for row in range(N) if in_conflict(row)]
+            for _ in range(max_steps):
+                if not candidates:
+                    # Lista mbaroi ose u zbraz pas nje zhvendosjeje me konflikte; kontrollo te gjithe rreshtat
+                    candidates = [row for row in range(N) if in_conflict(row)]
+                    if not candidates:
+                        return solution
+                if time.perf_counter() >= deadline:
+                    return None
+                index = rng.randrange(len(candidates))
+                row = candidates[index]
+                if not in_conflict(row):
+                    candidates[index] = candidates[-1]
+                    candidates.pop()
+                    continue
+                steps += 1
+
+                # Hiq mbretereshen dhe zgjidh kolonen me me pak konflikte (barazimet zgjidhen rastesisht)
+                old = solution[row]
+                col_count[old] -= 1
+                right_diagonals[row - old + N - 1] -= 1
+                left_diagonals[row + old] -= 1
+                solution[row] = -1
+                best_cost = None
+                best_cols = []
+                blocked = blocked_rows[row]
+                for col in range(N):
+                    if blocked >> col & 1:
+                        continue
+                    cost = col_count[col] + right_diagonals[row - col + N - 1] + left_diagonals[row + col]
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        best_cols = [col]
+                    elif cost == best_cost:
+                        best_cols.append(col)
+                if not best_cols:
+                    # I gjithe rreshti eshte i bllokuar: problemi nuk ka zgjidhje
+                    return None
+                col = rng.choice(best_cols)
+                solution[row] = col
+                col_count[col] += 1
+                right_diagonals[row - col + N - 1] += 1
+                left_diagonals[row + col] += 1
+                if best_cost > 0:
+                    # Mbreteresha e zhvendosur sulmon rreshta qe mund te mos jene ne liste
+                    candidates = []
+            restarts += 1
+        return None
+    finally:
+        if stats is not None:
+            stats['steps'] = steps
+            stats['restarts'] = restarts
+            stats['peak_frontier'] = 0
+
+# Menyrat e kerkimit, te gjitha me te njejten nenshkrim (N, blocked_cells, heuristic, stats=None)
+SEARCH_MODES = {
+    'a_star': a_star_n_queens,
+    'ida_star': ida_star_n_queens,
+    'beam': beam_search_n_queens,
+    'min_conflicts': min_conflicts_n_queens,
+}
+
+def solve_n_queens(N, blocked_cells, heuristic, mode='a_star', stats=None, **options):
+    """ Zgjidh problemin me menyren e zgjedhur; opsionet (p.sh. beam_width) i kalohen algoritmit """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Menyre e panjohur kerkimi: {mode!r} (zgjidh nga {sorted(SEARCH_MODES)})")
+    return SEARCH_MODES[mode](N, blocked_cells, heuristic, stats=stats, **options)
+
+def is_mirror_symmetric(N, blocked_cells):
+    """ Kontrollon nese qelizat e bllokuara jane simetrike ndaj pasqyrimit majtas-djathtas (col -> N - 1 - col) """
+    cells = {(row, col) for row, col in blocked_cells if 0 <= row < N and 0 <= col < N}
+    return cells == {(row, N - 1 - col) for row, col in cells}
+
+def solution_prefixes(N, blocked_cells, prefix_rows=2):
+    """
+    Ndan hapesiren e kerkimit ne prefikse te vlefshme te rreshtave te pare.
+    Kthen liste me (vendosjet, kolonat, diag. djathtas, diag. majtas, pasqyro), ku pasqyro tregon
+    qe zgjidhjet e prefiksit numerohen dy here (edhe si pasqyrim) kur bllokimet jane simetrike.
+    """
+    full = (1 << N) - 1
+    blocked_rows = blocked_row_masks(N, blocked_cells)
+    symmetric = is_mirror_symmetric(N, blocked_cells)
+    prefixes = []
+
+    def extend(placements, cols, right_diagonals, left_diagonals, mirror):
+        row = len(placements)
+        if row == min(prefix_rows, N):
+            prefixes.append((tuple(placements), cols, right_diagonals, left_diagonals, mirror))
+            return
+        free_columns = ~(cols | right_diagonals | left_diagonals | blocked_rows[row]) & full
+        while free_columns:
+            bit = free_columns & -free_columns
+            free_columns ^= bit
+            col = bit.bit_length() - 1
+            child_mirror = mirror
+            if row == 0 and symmetric:
+                # Mjafton gjysma e majte e rreshtit te pare; kolona e mesit (N tek) pasqyrohet ne vetvete
+                if col > (N - 1) // 2:
+                    continue
+                child_mirror = col < N // 2
+            extend(placements + [col], cols | bit, ((right_diagonals | bit) << 1) & full,
+                   (left_diagonals | bit) >> 1, child_mirror)
+
+    extend([], 0, 0, 0, False)
+    return prefixes
+
+def count_completions(N, blocked_rows, row, cols, right_diagonals, left_diagonals):
+    """ Numeron me backtracking me maska bitesh zgjidhjet qe plotesojne rreshtat row..N-1 """
+    if row == N:
+        return 1
+    full = (1 << N) - 1
+    count = 0
+    free_columns = ~(cols | right_diagonals | left_diagonals | blocked_rows[row]) & full
+    while free_columns:
+        bit = free_columns & -free_columns
+        free_columns ^= bit
+        count += count_completions(N, blocked_rows, row + 1, cols | bit, ((right_diagonals | bit) << 1) & full,
+                                   (left_diagonals | bit) >> 1)
+    return count
+
+def enumerate_completions(N, blocked_rows, placements, cols, right_diagonals, left_diagonals):
+    """ Gjeneron (pa ndertuar liste) te gjitha zgjidhjet qe plotesojne prefiksin placements """
+    full = (1 << N) - 1
+    state = list(placements)
+    # Stiva ruan per cdo rresht kolonat e pa provuara dhe maskat e atij rreshti
+    stack = [(~(cols | right_diagonals | left_diagonals | blocked_rows[len(state)]) & full
+              if len(state) < N else 0, cols, right_diagonals, left_diagonals)]
+    if len(state) == N:
+        yield list(state)
+        return
+    while stack:
+        free_columns, cols, right_diagonals, left_diagonals = stack[-1]
+        if not free_columns:
+            stack.pop()
+            if state[len(placements):]:
+                state.pop()
+            continue
+        bit = free_columns & -free_columns
+        stack[-1] = (free_columns ^ bit, cols, right_diagonals, left_diagonals)
+        state.append(bit.bit_length() - 1)
         row = len(state)
-        for col in range(N):
-            if (row, col) not in blocked_cells and is_safe(state, row, col, N):
-                new_state = state + [col]
-                heapq.heappush(open_list, (g + 1 + h(new_state), new_state, g + 1))
-
-    return None
+        if row == N:
+            yield list(state)
+            state.pop()
+            continue
+        cols, right_diagonals, left_diagonals = cols | bit, ((right_diagonals | bit) << 1) & full, (left_diagonals | bit) >> 1
+        stack.append((~(cols | right_diagonals | left_diagonals | blocked_rows[row]) & full,
+                      cols, right_diagonals, left_diagonals))
+
+def count_prefix_task(args):
+    """ Detyra e nje procesi: numri i zgjidhjeve te nje prefiksi (dyfishuar kur pasqyrohet) """
+    N, blocked_rows, (placements, cols, right_diagonals, left_diagonals, mirror) = args
+    count = count_completions(N, blocked_rows, len(placements), cols, right_diagonals, left_diagonals)
+    return 2 * count if mirror else count
+
+def enumerate_prefix_task(args):
+    """ Detyra e nje procesi: zgjidhjet e nje prefiksi, bashke me pasqyrimet kur kerkohen """
+    N, blocked_rows, (placements, cols, right_diagonals, left_diagonals, mirror) = args
+    solutions = []
+    for solution in enumerate_completions(N, blocked_rows, placements, cols, right_diagonals, left_diagonals):
+        solutions.append(solution)
+        if mirror:
+            solutions.append([N - 1 - col for col in solution])
+    return solutions
+
+def prefix_tasks(N, blocked_cells, prefix_rows):
+    blocked_rows = tuple(blocked_row_masks(N, blocked_cells))
+    return [(N, blocked_rows, prefix) for prefix in solution_prefixes(N, blocked_cells, prefix_rows)]
+
+def count_solutions(N, blocked_cells, workers=None, prefix_rows=2):
+    """ Numeron te gjitha zgjidhjet, duke i ndare prefikset e rreshtave te pare ne workers procese """
+    tasks = prefix_tasks(N, blocked_cells, prefix_rows)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return sum(map(count_prefix_task, tasks))
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        return sum(pool.imap_unordered(count_prefix_task, tasks))
+
+def enumerate_solutions(N, blocked_cells, workers=None, prefix_rows=2):
+    """
+    Gjeneron te gjitha zgjidhjet si lista kolonash (formati i visualize_board), pa i mbajtur te gjitha ne memorie.
+    Me shume procese, zgjidhjet vijne sipas prefikseve qe mbarojne te parat, jo ne rend leksikografik.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        # Ne nje proces gjenerohen drejtperdrejt, pa listat per prefiks
+        blocked_rows = blocked_row_masks(N, blocked_cells)
+        for placements, cols, right_diagonals, left_diagonals, mirror in solution_prefixes(N, blocked_cells, prefix_rows):
+            for solution in enumerate_completions(N, blocked_rows, placements, cols, right_diagonals, left_diagonals):
+                yield solution
+                if mirror:
+                    yield [N - 1 - col for col in solution]
+        return
+    tasks = prefix_tasks(N, blocked_cells, prefix_rows)
+    if not tasks:
+        return
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        for solutions in pool.imap_unordered(enumerate_prefix_task, tasks):
+            yield from solutions
 
 def heuristic_1(state, N, blocked_cells):
     """ Heuristika 1: Numri i mbretereshave te mbetura """
@@ -99,6 +415,172 @@ def admissible_combined_heuristic(state, N, blocked_cells):
     return min(h1, h2, h3, h4, h5)
 
 
+class IncrementalHeuristics:
+    """
+    Heuristikat e mesiperme per nje problem te vetem, te llogaritura nga te dhenat e nyjes.
+    Qelizat e lira per rresht llogariten nje here nga blocked_cells, qelizat e lira te nyjes
+    perditesohen nga prindi, dhe vlerat memorizohen sipas gjendjes se paketuar ne nje cache te kufizuar.
+    Me cache_size=0 nuk memorizohet asgje (A* dhe beam search e gjenerojne cdo gjendje vetem nje here).
+    Vlerat jane te njejta me ato te funksioneve heuristic_*.
+    """
+
+    def __init__(self, N, blocked_cells, cache_size=1 << 16):
+        self.N = N
+        self.full = (1 << N) - 1
+        self.blocked_rows = blocked_row_masks(N, blocked_cells)
+        # free_from_row[r] = qelizat e pabllokuara ne rreshtat r..N-1
+        self.free_from_row = [0] * (N + 1)
+        for r in range(N - 1, -1, -1):
+            self.free_from_row[r] = self.free_from_row[r + 1] + N - self.blocked_rows[r].bit_count()
+        self.total_free = self.free_from_row[0]
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def incremental_version(self, heuristic):
+        """ Kthen (funksioni(packed, row, free_cells), a duhen qelizat e lira) ose (None, False) per heuristike te panjohur """
+        versions = {
+            heuristic_1: (self.heuristic_1, False),
+            heuristic_2: (self.heuristic_2, False),
+            heuristic_3: (self.heuristic_1, False),
+            heuristic_4: (self.heuristic_4, False),
+            combined_heuristic: (self.combined_heuristic, True),
+            admissible_combined_heuristic: (self.admissible_combined_heuristic, True),
+        }
+        return versions.get(heuristic, (None, False))
+
+    def newly_attacked(self, row, bit, cols, right_diagonals, left_diagonals):
+        """ Numri i qelizave te lira ne rreshtat pas row qe i sulmon mbreteresha e re ne kolonen e bitit """
+        count = 0
+        full = self.full
+        for k in range(1, self.N - row):
+            attacked = (bit | (bit << k) | (bit >> k)) & full
+            taken = self.blocked_rows[row + k] | cols | (right_diagonals << k) | (left_diagonals >> k)
+            count += (attacked & ~taken).bit_count()
+        return count
+
+    def cached(self, name, packed, compute):
+        """ Kthen vleren nga cache-i ose e llogarit; hiq elementin me te vjeter kur cache-i mbushet """
+        if not self.cache_size:
+            return compute()
+        key = (name, packed)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute()
+            self.cache[key] = value
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return value
+
+    def heuristic_1(self, packed, row, free_cells):
+        return self.N - row
+
+    def heuristic_2(self, packed, row, free_cells):
+        return max(0, self.N - row - self.free_from_row[row])
+
+    def heuristic_4(self, packed, row, free_cells):
+        # Nuk memorizohet: zhurma duhet te jete e re per cdo thirrje
+        return self.N - row + random.uniform(0, 1)
+
+    def combined_value(self, row, free_cells):
+        blocked_positions = (self.N - row) * self.N - free_cells
+        return (self.N - row) + (self.N - free_cells) + blocked_positions / (self.N * self.N)
+
+    def combined_heuristic(self, packed, row, free_cells):
+        return self.cached('combined', packed, lambda: self.combined_value(row, free_cells))
+
+    def admissible_combined_heuristic(self, packed, row, free_cells):
+        # heuristic_4 >= heuristic_1 gjithmone, prandaj nuk e ndryshon minimumin;
+        # vlera e kombinuar llogaritet direkt qe cache-i te mbaje vetem nje element per gjendje
+        def compute():
+            h1 = self.heuristic_1(packed, row, free_cells)
+            return min(h1, self.heuristic_2(packed, row, free_cells), h1, self.combined_value(row, free_cells))
+        return self.cached('admissible', packed, compute)
+
+
+class SearchLimitReached(Exception):
+    """ Kerkimi kaloi numrin maksimal te nyjeve te zgjeruara (max_expansions) """
+
+
+class NodeExpander:
+    """
+    Gjeneron pasardhesit e nyjeve per te gjitha menyrat e kerkimit.
+    Nyja eshte (f(n), gjendja e paketuar, g(n), kolonat, diag. djathtas, diag. majtas, qelizat e lira), ku
+    maskat e diagonaleve jane te zhvendosura ne rreshtin e radhes.
+    Nese max_expansions jepet, zgjerimi pas atij numri nyjesh ngre SearchLimitReached.
+    memoize ruan vlerat heuristike ne cache; ka kuptim vetem kur gjendjet perseriten (IDA*).
+    """
+
+    def __init__(self, N, blocked_cells, heuristic, max_expansions=None, memoize=False):
+        self.N = N
+        self.blocked_cells = blocked_cells
+        self.heuristic = heuristic
+        self.full = (1 << N) - 1
+        self.width = N.bit_length()
+        self.evaluator = IncrementalHeuristics(N, blocked_cells, cache_size=1 << 16 if memoize else 0)
+        # Heuristikat e njohura llogariten nga te dhenat e nyjes pa e rindertuar gjendjen
+        self.fast_h, self.needs_free_cells = self.evaluator.incremental_version(heuristic)
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.max_expansions = max_expansions
+        self.limit_reached = False
+
+    def root(self):
+        """ Nyja fillestare (tabela bosh) """
+        free_cells = self.evaluator.total_free
+        if self.fast_h is None:
+            priority = self.heuristic([], self.N, self.blocked_cells)
+        else:
+            priority = self.fast_h(0, 0, free_cells)
+        return (priority, 0, 0, 0, 0, 0, free_cells)
+
+    def solution(self, node):
+        """ Kthen listen e kolonave te nyjes """
+        return unpack_state(node[1], node[2], self.N)
+
+    def children(self, node):
+        """ Kthen listen e pasardhesve te nyjes, nje per cdo kolone te lire te rreshtit te radhes """
+        if self.max_expansions is not None and self.nodes_expanded >= self.max_expansions:
+            self.limit_reached = True
+            raise SearchLimitReached()
+        _, packed, g, cols, right_diagonals, left_diagonals, free_cells = node
+        N = self.N
+        full = self.full
+        fast_h = self.fast_h
+        evaluator = self.evaluator
+        row = g
+        free_columns = ~(cols | right_diagonals | left_diagonals | evaluator.blocked_rows[row]) & full
+        row_free_cells = free_columns.bit_count()
+        state = unpack_state(packed, g, N) if fast_h is None else None
+        shift = self.width * (N - 1 - row)
+        children = []
+        while free_columns:
+            bit = free_columns & -free_columns
+            free_columns ^= bit
+            col = bit.bit_length() - 1
+            new_packed = packed | (col + 1) << shift
+            new_free_cells = 0
+            if fast_h is None:
+                priority = g + 1 + self.heuristic(state + [col], N, self.blocked_cells)
+            else:
+                if self.needs_free_cells:
+                    new_free_cells = free_cells - row_free_cells - evaluator.newly_attacked(
+                        row, bit, cols, right_diagonals, left_diagonals)
+                priority = g + 1 + fast_h(new_packed, g + 1, new_free_cells)
+            children.append((priority, new_packed, g + 1, cols | bit, ((right_diagonals | bit) << 1) & full,
+                             (left_diagonals | bit) >> 1, new_free_cells))
+        self.nodes_expanded += 1
+        self.nodes_generated += len(children)
+        return children
+
+    def report(self, stats, peak_frontier):
+        """ Shkruan statistikat e kerkimit ne fjalorin stats (nese eshte dhene) """
+        if stats is not None:
+            stats['nodes_expanded'] = self.nodes_expanded
+            stats['nodes_generated'] = self.nodes_generated
+            stats['peak_frontier'] = peak_frontier
+            stats['limit_reached'] = self.limit_reached
+
+
 def visualize_board(N, blocked_cells, solution):
     """ Vizualizon tabelen si matrice """
     board = [["." for _ in range(N)] for _ in range(N)]
@@ -126,43 +608,50 @@ def visualize_blocked_cells(N, blocked_cells):
     print()
 
 
-# Shembull: Zgjidh problemin per N = 8 me qeliza te bllokuara
-N = 8
-blocked_cells = {(0, 2), (3, 4), (5, 5)}
-
-# Shembull: Tabela fillestare me qelizat e bllokuara
-print("Tabela fillestare me qelizat e bllokuara:")
-visualize_blocked_cells(N, blocked_cells)
-
-# Zgjidh problemin me heuristiken e pare
-solution = a_star_n_queens(N, blocked_cells, heuristic_1)
-print("Zgjidhja me heuristiken 1:", solution)
-visualize_board(N, blocked_cells, solution)
-
-# Zgjidh problemin me heuristiken e dyte
-solution = a_star_n_queens(N, blocked_cells, heuristic_2)
-print("Zgjidhja me heuristiken 2:", solution)
-visualize_board(N, blocked_cells, solution)
-
-# Zgjidh problemin me heuristiken e trete
-solution = a_star_n_queens(N, blocked_cells, heuristic_3)
-print("Zgjidhja me heuristiken 3:", solution)
-visualize_board(N, blocked_cells, solution)
-
-# Zgjidh problemin me heuristikë që ka zhurmë
-solution = a_star_n_queens(N, blocked_cells, heuristic_4)
-print("Zgjidhja me heuristikë me zhurmë:", solution)
-visualize_board(N, blocked_cells, solution)
-
-# Zgjidh problemin me heuristikën e kombinuar
-solution = a_star_n_queens(N, blocked_cells, combined_heuristic)
-print("Zgjidhja me heuristikën e kombinuar:", solution)
-visualize_board(N, blocked_cells, solution)
-
-# Zgjidh problemin me heuristikën e kombinuar admissible
-solution = a_star_n_queens(N, blocked_cells, admissible_combined_heuristic)
-print("Zgjidhja me heuristikën admissible e kombinuar:", solution)
-visualize_board(N, blocked_cells, solution)
-
-
-
+if __name__ == "__main__":
+    # Shembull: Zgjidh problemin per N = 8 me qeliza te bllokuara
+    N = 8
+    blocked_cells = {(0, 2), (3, 4), (5, 5)}
+
+    # Shembull: Tabela fillestare me qelizat e bllokuara
+    print("Tabela fillestare me qelizat e bllokuara:")
+    visualize_blocked_cells(N, blocked_cells)
+
+    # Zgjidh problemin me heuristiken e pare
+    solution = a_star_n_queens(N, blocked_cells, heuristic_1)
+    print("Zgjidhja me heuristiken 1:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh problemin me heuristiken e dyte
+    solution = a_star_n_queens(N, blocked_cells, heuristic_2)
+    print("Zgjidhja me heuristiken 2:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh problemin me heuristiken e trete
+    solution = a_star_n_queens(N, blocked_cells, heuristic_3)
+    print("Zgjidhja me heuristiken 3:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh problemin me heuristikë që ka zhurmë
+    solution = a_star_n_queens(N, blocked_cells, heuristic_4)
+    print("Zgjidhja me heuristikë me zhurmë:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh problemin me heuristikën e kombinuar
+    solution = a_star_n_queens(N, blocked_cells, combined_heuristic)
+    print("Zgjidhja me heuristikën e kombinuar:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh problemin me heuristikën e kombinuar admissible
+    solution = a_star_n_queens(N, blocked_cells, admissible_combined_heuristic)
+    print("Zgjidhja me heuristikën admissible e kombinuar:", solution)
+    visualize_board(N, blocked_cells, solution)
+
+    # Zgjidh nje problem te madh me kerkim lokal min-conflicts (tabela nuk vizualizohet)
+    large_N = 1000
+    large_blocked_cells = {(r, (r * 7 + 3) % large_N) for r in range(0, large_N, 10)}
+    solution = min_conflicts_n_queens(large_N, large_blocked_cells, time_limit=10.0, seed=0)
+    print(f"Zgjidhja me min-conflicts per N = {large_N}:", "u gjet" if solution else "nuk u gjet")
+
+    # Numero te gjitha zgjidhjet per te njejten tabele
+    print("Numri i te gjitha zgjidhjeve:", count_solutions(N, blocked_cells))
@@ -1,3 +1,6 @@
+import argparse
+import math
+
 # Parametrat kryesor
 num_guests = 100  # Numri i mysafirëve
 num_tables = 10  # Numri i tavolinave
@@ -8,25 +11,41 @@ not_together = [(1, 5), (10, 13), (20, 25)]  # Çifte të mysafirëve
 # Mysafirët që duhet të jenë së bashku
 must_together = [(2, 3), (6, 7)]
 
-# Variablat SAT (mapohet mysafiri dhe tavolina me një numër të veçantë ndryshoreje)
-variables = {(guest, table): i * num_tables + table + 1 for i, guest in enumerate(range(1, num_guests + 1)) for table in
-             range(num_tables)}
+# Kapaciteti maksimal i secilës tavolinë (None = pa kufi)
+table_capacity = None
+
+# Kodimi i kushtit "të shumtën një" (at-most-one): 'pairwise', 'sequential', 'commander' ose 'product'
+amo_encoding = 'pairwise'
+
+
+# Variablat SAT (mapohet mysafiri dhe tavolina me një numër të veçantë ndryshoreje).
+# Llogaritet direkt, pa fjalor, që problemet e mëdha të mos mbajnë miliona çelësa në memorie.
+def variable(guest, table, tables=None):
+    """Numri i variablës për mysafirin guest (nga 1) në tavolinën table (nga 0); tables zëvendëson num_tables."""
+    return (guest - 1) * (num_tables if tables is None else tables) + table + 1
+
+
+class VariablePool:
+    """Jep variabla ndihmëse të reja pas variablave mysafir-tavolinë."""
+
+    def __init__(self, first_free):
+        self.num_variables = first_free - 1
+
+    def new(self):
+        self.num_variables += 1
+        return self.num_variables
 
 
 # Funksione ndihmëse
 
 def at_least_one(guest):
     """Siguro që mysafiri është në të paktën një tavolinë."""
-    return [variables[(guest, table)] for table in range(num_tables)]
+    return [variable(guest, table) for table in range(num_tables)]
 
 
-def at_most_one(guest):
+def at_most_one(guest, pool=None, encoding=None):
     """Siguro që mysafiri nuk është në më shumë se një tavolinë."""
-    clauses = []
-    for t1 in range(num_tables):
-        for t2 in range(t1 + 1, num_tables):
-            clauses.append([-variables[(guest, t1)], -variables[(guest, t2)]])
-    return clauses
+    return list(at_most_one_clauses(at_least_one(guest), pool, encoding or amo_encoding))
 
 
 def not_in_same_table(pair):
@@ -34,7 +53,7 @@ def not_in_same_table(pair):
     guest1, guest2 = pair
     clauses = []
     for table in range(num_tables):
-        clauses.append([-variables[(guest1, table)], -variables[(guest2, table)]])
+        clauses.append([-variable(guest1, table), -variable(guest2, table)])
     return clauses
 
 
@@ -43,33 +62,405 @@ def must_be_together(pair):
     guest1, guest2 = pair
     clauses = []
     for table in range(num_tables):
-        clauses.append([variables[(guest1, table)], -variables[(guest2, table)]])
-        clauses.append([-variables[(guest1, table)], variables[(guest2, table)]])
+        clauses.append([variable(guest1, table), -variable(guest2, table)])
+        clauses.append([-variable(guest1, table), variable(guest2, table)])
     return clauses
 
 
-# Gjenerimi i klauzolave
-clauses = []
-for guest in range(1, num_guests + 1):
-    clauses.append(at_least_one(guest))  # Çdo mysafir të jetë në të paktën një tavolinë
-    clauses.extend(at_most_one(guest))  # Mysafiri të jetë në më shumë se një tavolinë
+# Kodimet e kushtit "të shumtën një" mbi listën e literaleve. Përveç 'pairwise' (O(n^2) klauza),
+# kodimet përdorin variabla ndihmëse nga pool dhe japin O(n) klauza.
+
+def pairwise_amo(literals, pool):
+    """Kodimi me çifte: një klauzë për çdo çift literalesh."""
+    for i in range(len(literals)):
+        for j in range(i + 1, len(literals)):
+            yield [-literals[i], -literals[j]]
+
+
+def sequential_amo(literals, pool):
+    """Numëruesi sekuencial (Sinz): s_i tregon që një nga literalet 1..i është i vërtetë."""
+    n = len(literals)
+    if n <= 1:
+        return
+    previous = pool.new()
+    yield [-literals[0], previous]
+    for i in range(1, n - 1):
+        current = pool.new()
+        yield [-literals[i], current]
+        yield [-previous, current]
+        yield [-literals[i], -previous]
+        previous = current
+    yield [-literals[n - 1], -previous]
+
+
+def commander_amo(literals, pool, group_size=3):
+    """Kodimi me komandantë (Klieber-Kwon): grupe të vogla me çifte, një komandant për grup, rekursivisht."""
+    if len(literals) <= group_size + 1:
+        yield from pairwise_amo(literals, pool)
+        return
+    commanders = []
+    for start in range(0, len(literals), group_size):
+        group = literals[start:start + group_size]
+        commander = pool.new()
+        commanders.append(commander)
+        yield from pairwise_amo(group, pool)
+        for literal in group:
+            yield [-literal, commander]
+        # Komandanti është i vërtetë vetëm kur një literal i grupit është i vërtetë
+        yield [-commander] + group
+    yield from commander_amo(commanders, pool, group_size)
+
+
+def product_amo(literals, pool):
+    """Kodimi produkt (Chen): literalet vendosen në një rrjet p x q dhe kushti vendoset mbi rreshtat dhe kolonat."""
+    n = len(literals)
+    if n <= 4:
+        yield from pairwise_amo(literals, pool)
+        return
+    p = math.ceil(math.sqrt(n))
+    q = math.ceil(n / p)
+    rows = [pool.new() for _ in range(p)]
+    columns = [pool.new() for _ in range(q)]
+    for index, literal in enumerate(literals):
+        yield [-literal, rows[index // q]]
+        yield [-literal, columns[index % q]]
+    yield from product_amo(rows, pool)
+    yield from product_amo(columns, pool)
+
 
-for pair in not_together:
-    clauses.extend(not_in_same_table(pair))  # Mysafirët që nuk mund të jenë së bashku
+AMO_ENCODINGS = {
+    'pairwise': pairwise_amo,
+    'sequential': sequential_amo,
+    'commander': commander_amo,
+    'product': product_amo,
+}
 
-for pair in must_together:
-    clauses.extend(must_be_together(pair))  # Mysafirët që duhet të jenë së bashku
 
-# Gjenerimi i file-it CNF
-num_variables = num_guests * num_tables
-num_clauses = len(clauses)
+def at_most_one_clauses(literals, pool, encoding='pairwise'):
+    """Gjeneron klauzat e kushtit "të shumtën një" me kodimin e zgjedhur."""
+    if encoding not in AMO_ENCODINGS:
+        raise ValueError(f"Kodim i panjohur: {encoding!r} (zgjidh nga {sorted(AMO_ENCODINGS)})")
+    return AMO_ENCODINGS[encoding](literals, pool)
 
-with open("sat_problem.cnf", "w") as f:
-    # Shkruaj preambulën
-    f.write(f"p cnf {num_variables} {len(clauses)}\n")
 
-    # Shkruaj klauzolat
+def exactly_one_clauses(literals, pool, encoding='pairwise'):
+    """Gjeneron klauzat e kushtit "saktësisht një": të paktën një plus të shumtën një."""
+    yield list(literals)
+    yield from at_most_one_clauses(literals, pool, encoding)
+
+
+def at_most_k_clauses(literals, k, pool):
+    """Numëruesi sekuencial për "të shumtën k": s[i][j] tregon që të paktën j + 1 nga literalet 1..i janë të vërtetë."""
+    n = len(literals)
+    if k >= n:
+        return
+    if k == 0:
+        for literal in literals:
+            yield [-literal]
+        return
+    previous = [pool.new() for _ in range(k)]
+    yield [-literals[0], previous[0]]
+    for j in range(1, k):
+        yield [-previous[j]]
+    for i in range(1, n - 1):
+        current = [pool.new() for _ in range(k)]
+        yield [-literals[i], current[0]]
+        yield [-previous[0], current[0]]
+        for j in range(1, k):
+            yield [-literals[i], -previous[j - 1], current[j]]
+            yield [-previous[j], current[j]]
+        yield [-literals[i], -previous[k - 1]]
+        previous = current
+    yield [-literals[n - 1], -previous[k - 1]]
+
+
+def table_capacity_clauses(table, capacity, pool, guests=None, tables=None):
+    """Siguro që në tavolinë nuk ulen më shumë se capacity mysafirë (guests/tables zëvendësojnë globalet)."""
+    guests = num_guests if guests is None else guests
+    literals = [variable(guest, table, tables) for guest in range(1, guests + 1)]
+    return at_most_k_clauses(literals, capacity, pool)
+
+
+def generate_clauses(pool, encoding=None, capacity=None):
+    """Gjeneron të gjitha klauzat e problemit një nga një, pa i mbajtur në një listë."""
+    encoding = encoding or amo_encoding
+    for guest in range(1, num_guests + 1):
+        yield from exactly_one_clauses(at_least_one(guest), pool, encoding)  # Çdo mysafir në saktësisht një tavolinë
+
+    for pair in not_together:
+        yield from not_in_same_table(pair)  # Mysafirët që nuk mund të jenë së bashku
+
+    for pair in must_together:
+        yield from must_be_together(pair)  # Mysafirët që duhet të jenë së bashku
+
+    if capacity is not None:
+        for table in range(num_tables):
+            yield from table_capacity_clauses(table, capacity, pool)
+
+
+# Shkrimi i file-it CNF. Klauzat shkruhen direkt në disk në blloqe; numri i klauzave dhe variablave
+# (bashkë me ndihmëset) dihet vetëm në fund, prandaj:
+#  - 'precount': klauzat gjenerohen një herë vetëm për t'u numëruar, pastaj shkruhen me header-in e saktë;
+#  - 'patch': header-i shkruhet me hapësira rezervë dhe mbishkruhet në fund (një kalim i vetëm).
+HEADER_WIDTH = 48
+WRITE_BATCH = 10000
+
+
+def write_clauses(f, clauses):
+    """Shkruan klauzat në blloqe dhe kthen numrin e tyre."""
+    count = 0
+    batch = []
     for clause in clauses:
         # Çdo klauzolë kthehet në tekst me literale të ndarë me hapësirë dhe përfunduar me '0'
-        f.write(" ".join(map(str, clause)) + " 0\n")
+        batch.append(" ".join(map(str, clause)) + " 0\n")
+        if len(batch) == WRITE_BATCH:
+            f.write("".join(batch))
+            count += len(batch)
+            batch = []
+    f.write("".join(batch))
+    return count + len(batch)
+
+
+def write_cnf(path, encoding=None, capacity=None, header='precount'):
+    """Shkruan problemin në file-in CNF dhe kthen (numri i variablave, numri i klauzave)."""
+    first_free = num_guests * num_tables + 1
+    if header == 'precount':
+        pool = VariablePool(first_free)
+        num_clauses = sum(1 for _ in generate_clauses(pool, encoding, capacity))
+        num_variables = pool.num_variables
+        with open(path, "w") as f:
+            f.write(f"p cnf {num_variables} {num_clauses}\n")
+            written = write_clauses(f, generate_clauses(VariablePool(first_free), encoding, capacity))
+        assert written == num_clauses
+        return num_variables, num_clauses
+    if header == 'patch':
+        pool = VariablePool(first_free)
+        with open(path, "w") as f:
+            f.write(" " * HEADER_WIDTH + "\n")
+            num_clauses = write_clauses(f, generate_clauses(pool, encoding, capacity))
+            f.seek(0)
+            f.write(f"p cnf {pool.num_variables} {num_clauses}".ljust(HEADER_WIDTH))
+        return pool.num_variables, num_clauses
+    raise ValueError(f"Mënyrë e panjohur për header-in: {header!r} (zgjidh 'precount' ose 'patch')")
+
+
+# Parapërpunimi para shkrimit/zgjidhjes:
+#  - mysafirët e must_together bashkohen (union-find) në një grup me një bashkësi variablash;
+#  - tavolinat janë të njëjta, prandaj thyhet simetria: grupi i mund të ulet në tavolinën t > 0 vetëm
+#    nëse tavolina t - 1 është përdorur nga një grup para tij (tavolinat hapen me radhë, first-fit);
+#  - propagimi i klauzave njësi dhe heqja e klauzave të nënshtruara (subsumption).
+# Modeli ruan lidhjen mysafir -> grup që zgjidhja të lexohet për çdo mysafir.
+
+def guest_groups():
+    """Bashkon mysafirët e must_together me union-find; kthen {mysafir: indeksi i grupit} dhe madhësitë e grupeve."""
+    parent = list(range(num_guests + 1))
+
+    def find(guest):
+        while parent[guest] != guest:
+            parent[guest] = parent[parent[guest]]
+            guest = parent[guest]
+        return guest
+
+    for guest1, guest2 in must_together:
+        root1, root2 = find(guest1), find(guest2)
+        if root1 != root2:
+            parent[max(root1, root2)] = min(root1, root2)
+
+    group_of = {}
+    sizes = []
+    index_of_root = {}
+    for guest in range(1, num_guests + 1):
+        root = find(guest)
+        if root not in index_of_root:
+            index_of_root[root] = len(sizes)
+            sizes.append(0)
+        group_of[guest] = index_of_root[root]
+        sizes[index_of_root[root]] += 1
+    return group_of, sizes
+
+
+def group_variable(group, table):
+    """Numri i variablës për grupin group (nga 0) në tavolinën table (nga 0)."""
+    return group * num_tables + table + 1
+
+
+def symmetry_breaking_clauses(num_groups, pool):
+    """Tavolinat hapen me radhë: used[i][t] tregon që një nga grupet 0..i ulet në tavolinën t."""
+    for group in range(num_groups):
+        # Grupi i nuk mund të ulet në një tavolinë me indeks më të madh se i
+        for table in range(group + 1, num_tables):
+            yield [-group_variable(group, table)]
+    previous = None
+    for group in range(num_groups - 1):
+        used = [pool.new() for _ in range(min(group + 1, num_tables))]
+        for table, variable_used in enumerate(used):
+            # used[i][t] -> used[i - 1][t] ose grupi i në tavolinën t
+            if previous is not None and table < len(previous):
+                yield [-variable_used, previous[table], group_variable(group, table)]
+            else:
+                yield [-variable_used, group_variable(group, table)]
+        for table in range(1, min(group + 2, num_tables)):
+            # Grupi i + 1 në tavolinën t kërkon që tavolina t - 1 të jetë përdorur nga grupet 0..i
+            yield [-group_variable(group + 1, table), used[table - 1]]
+        previous = used
+
+
+def propagate_units(clauses):
+    """
+    Heq literalet e përsëritura dhe tautologjitë, pastaj propagon klauzat njësi.
+    Kthen (klauzat e mbetura, {variabla: vlera e fiksuar}); kontradikta kthehet si klauzë bosh.
+    """
+    alive = []
+    for clause in clauses:
+        literals = list(dict.fromkeys(clause))
+        if not any(-literal in literals for literal in literals):
+            alive.append(literals)
+
+    occurrences = {}
+    for index, clause in enumerate(alive):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+
+    fixed = {}
+    satisfied = [False] * len(alive)
+    queue = [clause[0] for clause in alive if len(clause) == 1]
+    while queue:
+        literal = queue.pop()
+        variable_number = abs(literal)
+        if variable_number in fixed:
+            if fixed[variable_number] != (literal > 0):
+                return [[]], fixed
+            continue
+        fixed[variable_number] = literal > 0
+        for index in occurrences.get(literal, ()):
+            satisfied[index] = True
+        for index in occurrences.get(-literal, ()):
+            if satisfied[index]:
+                continue
+            clause = alive[index]
+            clause.remove(-literal)
+            if not clause:
+                return [[]], fixed
+            if len(clause) == 1:
+                queue.append(clause[0])
+    return [clause for index, clause in enumerate(alive) if not satisfied[index]], fixed
+
+
+def remove_subsumed(clauses):
+    """Heq klauzat që përmbajnë plotësisht një klauzë tjetër (dhe dublikatat)."""
+    sets = [frozenset(clause) for clause in clauses]
+    occurrences = {}
+    for index, clause in enumerate(sets):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+
+    removed = [False] * len(sets)
+    for index in sorted(range(len(sets)), key=lambda i: len(sets[i])):
+        if removed[index] or not sets[index]:
+            continue
+        clause = sets[index]
+        # Mjafton të kontrollohen klauzat që përmbajnë literalin më të rrallë të klauzës
+        rarest = min(clause, key=lambda literal: len(occurrences[literal]))
+        for other in occurrences[rarest]:
+            if other == index or removed[other] or len(sets[other]) < len(clause):
+                continue
+            if len(sets[other]) == len(clause) and other < index:
+                continue
+            if clause <= sets[other]:
+                removed[other] = True
+    return [clause for index, clause in enumerate(clauses) if not removed[index]]
+
+
+class PreprocessedModel:
+    """Klauzat e parapërpunuara bashkë me lidhjen mysafir -> grup dhe vlerat e fiksuara nga propagimi."""
+
+    def __init__(self, num_variables, clauses, group_of, fixed):
+        self.num_variables = num_variables
+        self.clauses = clauses
+        self.group_of = group_of
+        self.fixed = fixed
+
+    def value(self, assignment, variable_number):
+        """Vlera e variablës: nga propagimi nëse është fiksuar, përndryshe nga zgjidhja (bytearray ose listë)."""
+        if variable_number in self.fixed:
+            return self.fixed[variable_number]
+        return bool(assignment[variable_number - 1])
+
+    def decode(self, assignment):
+        """Kthen {mysafir: tavolina} nga vlerat e variablave të modelit të parapërpunuar."""
+        seating = {}
+        for guest, group in self.group_of.items():
+            for table in range(num_tables):
+                if self.value(assignment, group_variable(group, table)):
+                    seating[guest] = table
+                    break
+        return seating
+
+
+def build_preprocessed_model(encoding=None, capacity=None, symmetry_breaking=True):
+    """Ndërton modelin me grupe, thyerje simetrie, propagim njësi dhe subsumption (në memorie)."""
+    encoding = encoding or amo_encoding
+    group_of, sizes = guest_groups()
+    pool = VariablePool(len(sizes) * num_tables + 1)
+    clauses = []
+    for group in range(len(sizes)):
+        clauses.extend(exactly_one_clauses([group_variable(group, table) for table in range(num_tables)], pool,
+                                           encoding))
+
+    for guest1, guest2 in not_together:
+        group1, group2 = group_of[guest1], group_of[guest2]
+        if group1 == group2:
+            # Dy mysafirë që duhet të jenë bashkë dhe jo bashkë: problemi nuk ka zgjidhje
+            clauses.append([])
+            continue
+        for table in range(num_tables):
+            clauses.append([-group_variable(group1, table), -group_variable(group2, table)])
+
+    if capacity is not None:
+        for table in range(num_tables):
+            # Grupi numërohet aq herë sa ka mysafirë
+            literals = [group_variable(group, table) for group, size in enumerate(sizes) for _ in range(size)]
+            clauses.extend(at_most_k_clauses(literals, capacity, pool))
+
+    if symmetry_breaking:
+        clauses.extend(symmetry_breaking_clauses(len(sizes), pool))
+
+    if any(not clause for clause in clauses):
+        clauses, fixed = [[]], {}
+    else:
+        clauses, fixed = propagate_units(clauses)
+        clauses = remove_subsumed(clauses)
+    return PreprocessedModel(pool.num_variables, clauses, group_of, fixed)
+
+
+def write_preprocessed_cnf(path, encoding=None, capacity=None, symmetry_breaking=True):
+    """Shkruan modelin e parapërpunuar në file-in CNF dhe e kthen (për leximin e zgjidhjes)."""
+    model = build_preprocessed_model(encoding, capacity, symmetry_breaking)
+    with open(path, "w") as f:
+        f.write(f"p cnf {model.num_variables} {len(model.clauses)}\n")
+        write_clauses(f, model.clauses)
+    return model
+
+
+def main(argv=None):
+    global num_guests, num_tables
+    parser = argparse.ArgumentParser(description="Gjeneron problemin e uljes së mysafirëve si file CNF.")
+    parser.add_argument('--guests', type=int, default=num_guests)
+    parser.add_argument('--tables', type=int, default=num_tables)
+    parser.add_argument('--encoding', choices=sorted(AMO_ENCODINGS), default=amo_encoding)
+    parser.add_argument('--capacity', type=int, default=table_capacity, help="mysafirë për tavolinë (pa kufi nëse mungon)")
+    parser.add_argument('--header', choices=['precount', 'patch'], default='precount')
+    parser.add_argument('--preprocess', action='store_true',
+                        help="bashko must_together, thyej simetrinë e tavolinave, propago njësitë (në memorie)")
+    parser.add_argument('--output', default="sat_problem.cnf")
+    args = parser.parse_args(argv)
+
+    num_guests, num_tables = args.guests, args.tables
+    if args.preprocess:
+        write_preprocessed_cnf(args.output, args.encoding, args.capacity)
+    else:
+        write_cnf(args.output, args.encoding, args.capacity, args.header)
+
 
+if __name__ == "__main__":
+    main()
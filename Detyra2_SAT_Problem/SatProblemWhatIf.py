@@ -0,0 +1,121 @@
+import time
+
+from z3 import *
+
+import SatProblem
+from SatProblem import VariablePool, exactly_one_clauses, table_capacity_clauses, variable
+from TestSatProblemCnf import extract_assignment, load_clauses_z3
+
+
+# Shërbim "what-if" për variantet e uljes: modeli bazë (çdo mysafir në saktësisht një tavolinë, kapaciteti)
+# ngarkohet një herë në një solver z3. Çdo çift not_together/must_together shtohet si klauza të ruajtura
+# nga një variabël zgjedhëse (selector) dhe aktivizohet vetëm si supozim (assumption) në check(), kështu që
+# varianti i ri kërkon vetëm një kontroll inkremental dhe UNSAT core-i tregon çiftet në konflikt.
+class SeatingWhatIf:
+    """Solver inkremental për variantet e problemit të uljes me supozime."""
+
+    def __init__(self, guests=None, tables=None, encoding=None, capacity=None):
+        # Madhësia ruhet në instancë dhe u jepet ndihmësve, pa ndryshuar globalet e SatProblem,
+        # që disa instanca me madhësi të ndryshme të mund të përdoren njëkohësisht
+        self.num_guests = guests or SatProblem.num_guests
+        self.num_tables = tables or SatProblem.num_tables
+
+        pool = VariablePool(self.num_guests * self.num_tables + 1)
+        clauses = []
+        for guest in range(1, self.num_guests + 1):
+            literals = [self.variable(guest, table) for table in range(self.num_tables)]
+            clauses.extend(exactly_one_clauses(literals, pool, encoding or SatProblem.amo_encoding))
+        if capacity is not None:
+            for table in range(self.num_tables):
+                clauses.extend(table_capacity_clauses(table, capacity, pool, self.num_guests, self.num_tables))
+        self.num_variables = pool.num_variables
+
+        self.solver = load_clauses_z3(self.num_variables, clauses)
+        self.solver.set("core.minimize", True)
+        self.variables = self.parsed_variables()
+        self.selectors = {}  # (lloji, mysafiri1, mysafiri2) -> variabla zgjedhëse
+        self.pairs = {}  # emri i variablës zgjedhëse -> (lloji, mysafiri1, mysafiri2)
+
+    def variable(self, guest, table):
+        return variable(guest, table, self.num_tables)
+
+    def parsed_variables(self):
+        """Variablat e mysafir-tavolinë si objekte z3, marrë nga klauzat e lexuara (emrat 'k!<i>' të DIMACS)."""
+        # Bool('k!1') do të ishte një variabël tjetër, prandaj përdoren konstantet e vetë parser-it
+        found = {}
+        seen = set()
+        stack = list(self.solver.assertions())
+        while stack:
+            expression = stack.pop()
+            if expression.get_id() in seen:
+                continue
+            seen.add(expression.get_id())
+            if is_const(expression) and expression.decl().kind() == Z3_OP_UNINTERPRETED:
+                found[expression.decl().name()] = expression
+            else:
+                stack.extend(expression.children())
+        return [found.get(f"k!{i}") for i in range(self.num_guests * self.num_tables + 1)]
+
+    def selector(self, kind, guest1, guest2):
+        """Kthen variablën zgjedhëse të çiftit; klauzat e ruajtura shtohen herën e parë."""
+        key = (kind, min(guest1, guest2), max(guest1, guest2))
+        if key in self.selectors:
+            return self.selectors[key]
+        name = f"{kind}_{key[1]}_{key[2]}"
+        guard = Bool(name)
+        for table in range(self.num_tables):
+            first = self.variables[self.variable(key[1], table)]
+            second = self.variables[self.variable(key[2], table)]
+            if kind == 'not_together':
+                self.solver.add(Or(Not(guard), Not(first), Not(second)))
+            elif kind == 'must_together':
+                self.solver.add(Or(Not(guard), first, Not(second)))
+                self.solver.add(Or(Not(guard), Not(first), second))
+            else:
+                raise ValueError(f"Lloj i panjohur çifti: {kind!r}")
+        self.selectors[key] = guard
+        self.pairs[name] = key
+        return guard
+
+    def check(self, not_together=(), must_together=()):
+        """
+        Kontrollon variantin me çiftet e dhëna dhe kthen një fjalor me:
+        'satisfiable', 'seating' ({mysafir: tavolina} kur ka zgjidhje), 'conflict' (çiftet e UNSAT core-it)
+        dhe 'seconds' (koha e kontrollit).
+        """
+        assumptions = [self.selector('not_together', *pair) for pair in not_together]
+        assumptions += [self.selector('must_together', *pair) for pair in must_together]
+
+        start = time.perf_counter()
+        result = self.solver.check(*assumptions)
+        elapsed = time.perf_counter() - start
+
+        if result == sat:
+            assignment = extract_assignment(self.solver.model(), self.num_variables)
+            seating = {}
+            for guest in range(1, self.num_guests + 1):
+                for table in range(self.num_tables):
+                    if assignment[self.variable(guest, table) - 1]:
+                        seating[guest] = table
+                        break
+            return {'satisfiable': True, 'seating': seating, 'conflict': None, 'seconds': elapsed}
+        if result == unsat:
+            conflict = sorted(self.pairs[guard.decl().name()] for guard in self.solver.unsat_core())
+            return {'satisfiable': False, 'seating': None, 'conflict': conflict, 'seconds': elapsed}
+        raise Z3Exception(f"z3 nuk e vendosi variantin: {self.solver.reason_unknown()}")
+
+
+if __name__ == "__main__":
+    service = SeatingWhatIf()
+
+    # Varianti bazë nga SatProblem.py
+    result = service.check(SatProblem.not_together, SatProblem.must_together)
+    print("Varianti bazë:", "ka zgjidhje" if result['satisfiable'] else "nuk ka zgjidhje",
+          f"({result['seconds']:.4f} s)")
+
+    # What-if: mysafirët 2 dhe 5 duhet të jenë bashkë, por 3 dhe 5 jo (ndërsa 2 dhe 3 janë bashkë)
+    result = service.check(SatProblem.not_together + [(3, 5)], SatProblem.must_together + [(2, 5)])
+    print("Varianti i ri:", "ka zgjidhje" if result['satisfiable'] else "nuk ka zgjidhje",
+          f"({result['seconds']:.4f} s)")
+    if not result['satisfiable']:
+        print("Çiftet në konflikt:", result['conflict'])
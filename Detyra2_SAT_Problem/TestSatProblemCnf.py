@@ -1,3 +1,14 @@
+import argparse
+import json
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from itertools import compress, repeat
+from operator import add, not_, sub
+
 from z3 import *
 
 
@@ -19,6 +30,125 @@ def read_cnf(file_path):
     return num_vars, clauses
 
 
+# Leximi i shpejte i file-ve te medha CNF: file-i hapet me mmap dhe literalet lexohen ne blloqe ne nje
+# array('i') te sheshte (pa zerot), me nje array offset-esh per fillimin e cdo klauze (formati CSR):
+# klauza i eshte literals[offsets[i]:offsets[i + 1]]
+CNF_CHUNK_SIZE = 1 << 20
+
+
+def parse_cnf_header(line):
+    """Kthen (num_vars, num_clauses) nga rreshti 'p cnf <variabla> <klauza>'."""
+    parts = line.split()
+    if len(parts) != 4 or parts[0] != b'p' or parts[1] != b'cnf':
+        raise ValueError(f"Header i pavlefshem CNF: {line.decode(errors='replace').strip()!r}")
+    try:
+        num_vars, num_clauses = int(parts[2]), int(parts[3])
+    except ValueError:
+        raise ValueError(f"Header i pavlefshem CNF: {line.decode(errors='replace').strip()!r}") from None
+    if num_vars < 0 or num_clauses < 0:
+        raise ValueError(f"Header CNF me numra negative: {num_vars} {num_clauses}")
+    return num_vars, num_clauses
+
+
+def strip_cnf_comments(chunk):
+    """Heq rreshtat e komenteve ('c ...') nga nje bllok te dhenash."""
+    if not chunk.startswith(b'c') and b'\nc' not in chunk:
+        return chunk
+    return b'\n'.join(line for line in chunk.split(b'\n') if not line.startswith(b'c'))
+
+
+def iter_cnf_chunks(file_path, chunk_size=CNF_CHUNK_SIZE):
+    """
+    Lexon file-in CNF ne blloqe dhe gjeneron (num_vars, literals, offsets) per klauzat e plota te cdo blloku.
+    Klauzat mund te shtrihen ne disa rreshta; numrat ne header kontrollohen ne fund te leximit.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"File-i CNF eshte bosh: {file_path}") from None
+        with mm:
+            # Komentet dhe rreshtat bosh para header-it
+            header = None
+            while header is None:
+                line = mm.readline()
+                if not line:
+                    raise ValueError(f"Mungon header-i 'p cnf' ne {file_path}")
+                stripped = line.strip()
+                if stripped.startswith(b'p'):
+                    header = parse_cnf_header(stripped)
+                elif stripped and not stripped.startswith(b'c'):
+                    raise ValueError(f"Klauze para header-it 'p cnf' ne {file_path}")
+            num_vars, num_clauses = header
+
+            # Disa file (p.sh. SATLIB) mbarojne me nje rresht '%'
+            data_start = mm.tell()
+            data_end = mm.find(b'\n%', data_start - 1)
+            if data_end == -1:
+                data_end = len(mm)
+
+            clause_count = 0
+            max_var = 0
+            pending = array('i')  # Literalet e klauzes qe vazhdon ne bllokun tjeter
+            position = data_start
+            while position < data_end:
+                end = mm.find(b'\n', min(position + chunk_size, data_end) - 1, data_end)
+                end = data_end if end == -1 else end + 1
+                chunk = strip_cnf_comments(mm[position:end].lstrip())
+                position = end
+                try:
+                    tokens = array('i', map(int, chunk.split()))
+                except ValueError:
+                    raise ValueError(f"Literal i pavlefshem ne {file_path}") from None
+                if not tokens:
+                    continue
+
+                if pending:
+                    tokens = pending + tokens
+                # Zeroja k-te ne poziten p mbyll klauzen k, e cila mbaron pas p - k literaleve
+                zeros = array('q', compress(range(len(tokens)), map(not_, tokens)))
+                complete = zeros[-1] + 1 if zeros else 0
+                pending = tokens[complete:]
+                literals = array('i', filter(None, tokens[:complete]))
+                offsets = array('q', [0])
+                offsets.extend(map(sub, zeros, range(len(zeros))))
+
+                if literals:
+                    max_var = max(max_var, max(literals), -min(literals))
+                clause_count += len(offsets) - 1
+                if len(offsets) > 1:
+                    yield num_vars, literals, offsets
+
+    if pending:
+        raise ValueError(f"Klauza e fundit nuk mbyllet me 0 ne {file_path}")
+    if clause_count != num_clauses:
+        raise ValueError(f"Header-i deklaron {num_clauses} klauza, por file-i ka {clause_count}")
+    if max_var > num_vars:
+        raise ValueError(f"Header-i deklaron {num_vars} variabla, por perdoret variabli {max_var}")
+
+
+def read_cnf_csr(file_path, chunk_size=CNF_CHUNK_SIZE):
+    """Lexon te gjithe file-in CNF dhe kthen (num_vars, literals, offsets) ne formatin CSR."""
+    num_vars = None
+    literals = array('i')
+    offsets = array('q', [0])
+    for chunk_vars, chunk_literals, chunk_offsets in iter_cnf_chunks(file_path, chunk_size):
+        num_vars = chunk_vars
+        base = len(literals)
+        literals.extend(chunk_literals)
+        offsets.extend(map(add, chunk_offsets[1:], repeat(base)))
+    if num_vars is None:
+        # File pa klauza: header-i lexohet perseri vetem per numrin e variablave
+        num_vars = read_cnf_header(file_path)[0]
+    return num_vars, literals, offsets
+
+
+def iter_csr_clauses(literals, offsets):
+    """Gjeneron klauzat si lista nga formati CSR."""
+    for i in range(len(offsets) - 1):
+        yield literals[offsets[i]:offsets[i + 1]].tolist()
+
+
 # Funksioni për të krijuar dhe zgjidhur SAT përmes z3
 def solve_cnf(num_vars, clauses):
     solver = Solver()
@@ -39,14 +169,305 @@ def solve_cnf(num_vars, clauses):
         return None
 
 
+# Ngarkimi ne bllok ne z3: klauzat i jepen parser-it DIMACS te z3 si tekst ose file, pa krijuar
+# objekte Bool/Or ne Python per cdo klauze. Variablat e DIMACS emertohen nga z3 'k!<i>'.
+def dimacs_text(num_vars, clauses, num_clauses=None):
+    """Kthen tekstin DIMACS (pa komente, sic e pret z3) per klauzat e dhena."""
+    if num_clauses is None:
+        clauses = list(clauses)
+        num_clauses = len(clauses)
+    lines = [f"p cnf {num_vars} {num_clauses}"]
+    lines.extend(" ".join(map(str, clause)) + " 0" for clause in clauses)
+    return "\n".join(lines) + "\n"
+
+
+def load_cnf_file_z3(file_path, solver=None):
+    """Ngarkon file-in CNF ne solver; file-t .cnf/.dimacs i lexon direkt parser-i i z3."""
+    if solver is None:
+        solver = Solver()
+    if os.path.splitext(file_path)[1].lower() in ('.cnf', '.dimacs'):
+        try:
+            solver.from_file(file_path)
+            return solver
+        except Z3Exception:
+            # Parser-i i z3 nuk pranon p.sh. rreshtin '%' te SATLIB; lexohet me lexuesin CSR
+            solver.reset()
+    num_vars, literals, offsets = read_cnf_csr(file_path)
+    solver.from_string(dimacs_text(num_vars, iter_csr_clauses(literals, offsets), len(offsets) - 1))
+    return solver
+
+
+def load_clauses_z3(num_vars, clauses, solver=None):
+    """Ngarkon klauzat (lista listash) ne solver me nje thirrje te vetme te parser-it DIMACS."""
+    if solver is None:
+        solver = Solver()
+    solver.from_string(dimacs_text(num_vars, clauses))
+    return solver
+
+
+def extract_assignment(model, num_vars):
+    """
+    Kthen vlerat e variablave ne nje kalim mbi modelin si bytearray (1 = True), ku indeksi i eshte variabli i + 1.
+    Pranon emrat 'k!<i>' (ngarkimi DIMACS) dhe 'x<i>' (solve_cnf); variablat pa vlere ne model jane 0.
+    """
+    assignment = bytearray(num_vars)
+    for decl in model.decls():
+        name = decl.name()
+        if name.startswith('k!'):
+            index = name[2:]
+        elif name.startswith('x'):
+            index = name[1:]
+        else:
+            continue
+        if index.isdigit() and 0 < int(index) <= num_vars and is_true(model[decl]):
+            assignment[int(index) - 1] = 1
+    return assignment
+
+
+def solve_cnf_file(file_path):
+    """Zgjidh file-in CNF me ngarkim ne bllok; kthen vlerat si bytearray ose None nese formula s'ka zgjidhje."""
+    num_vars = read_cnf_header(file_path)[0]
+    solver = load_cnf_file_z3(file_path)
+    if solver.check() == sat:
+        return extract_assignment(solver.model(), num_vars)
+    return None
+
+
+def read_cnf_header(file_path):
+    """Lexon vetem header-in 'p cnf' dhe kthen (num_vars, num_clauses)."""
+    with open(file_path, 'rb') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith(b'p'):
+                return parse_cnf_header(stripped)
+            if stripped and not stripped.startswith(b'c'):
+                break
+    raise ValueError(f"Mungon header-i 'p cnf' ne {file_path}")
+
+
+# Zgjidhës i thjeshtë DPLL në Python (pa z3), si rezervë në portofol: dy literale të vëzhguara për
+# propagimin e njësive, degëzim sipas shpeshtësisë së variablave dhe kthim kronologjik mbrapa.
+def dpll_solve(num_vars, clauses, deadline=None):
+    """Kthen vlerat si bytearray, None nëse formula s'ka zgjidhje; ngre TimeoutError pas deadline."""
+    value = [0] * (num_vars + 1)  # 0 = pa vlerë, 1 = e vërtetë, -1 = e gabuar
+    watches = {}
+    trail = []
+    units = []
+    stored = []
+    occurrences = [0] * (num_vars + 1)
+    polarity = [0] * (num_vars + 1)  # > 0 kur variabli shfaqet më shpesh pozitiv
+    for clause in clauses:
+        clause = list(dict.fromkeys(clause))
+        if not clause:
+            return None
+        for literal in clause:
+            occurrences[abs(literal)] += 1
+            polarity[abs(literal)] += 1 if literal > 0 else -1
+        if len(clause) == 1:
+            units.append(clause[0])
+            continue
+        stored.append(clause)
+        watches.setdefault(clause[0], []).append(clause)
+        watches.setdefault(clause[1], []).append(clause)
+
+    def literal_value(literal):
+        return value[literal] if literal > 0 else -value[-literal]
+
+    def assign(literal):
+        """Vendos literalin të vërtetë; kthen False nëse ishte i gabuar."""
+        current = literal_value(literal)
+        if current:
+            return current > 0
+        value[abs(literal)] = 1 if literal > 0 else -1
+        trail.append(literal)
+        return True
+
+    def propagate(head):
+        """Propagon literalet e trail-it nga pozicioni head; kthen False kur del kontradiktë."""
+        while head < len(trail):
+            false_literal = -trail[head]
+            head += 1
+            watching = watches.get(false_literal, [])
+            keep = []
+            conflict = False
+            for index, clause in enumerate(watching):
+                if conflict:
+                    keep.append(clause)
+                    continue
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if literal_value(clause[0]) > 0:
+                    keep.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    if literal_value(clause[k]) >= 0:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    keep.append(clause)
+                    if not assign(clause[0]):
+                        conflict = True
+            watches[false_literal] = keep
+            if conflict:
+                return False
+        return True
+
+    for literal in units:
+        if not assign(literal):
+            return None
+    if not propagate(0):
+        return None
+
+    order = sorted(range(1, num_vars + 1), key=lambda v: -occurrences[v])
+    decisions = []  # (gjatësia e trail-it para vendimit, literali, a është provuar edhe e kundërta)
+    while True:
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError("DPLL kaloi kohën e lejuar")
+        variable_number = next((v for v in order if value[v] == 0), None)
+        if variable_number is None:
+            return bytearray(1 if value[v] > 0 else 0 for v in range(1, num_vars + 1))
+        literal = variable_number if polarity[variable_number] > 0 else -variable_number
+        decisions.append((len(trail), literal, False))
+        assign(literal)
+        head = len(trail) - 1
+        while not propagate(head):
+            # Kthim mbrapa te vendimi i fundit që nuk është provuar me vlerën e kundërt
+            while decisions and decisions[-1][2]:
+                decisions.pop()
+            if not decisions:
+                return None
+            size, literal, _ = decisions.pop()
+            for undone in trail[size:]:
+                value[abs(undone)] = 0
+            del trail[size:]
+            decisions.append((size, -literal, True))
+            assign(-literal)
+            head = size
+
+
+# Portofoli: disa konfigurime zgjidhësi garojnë në procese të veçanta mbi të njëjtin file dhe fiton
+# përgjigjja e parë. Çdo proces e lexon file-in me read_cnf.
+PORTFOLIO_CONFIGS = [
+    {'name': 'z3', 'solver': 'z3'},
+    {'name': 'z3-seed-1', 'solver': 'z3', 'random_seed': 1},
+    {'name': 'z3-seed-2', 'solver': 'z3', 'random_seed': 2},
+    {'name': 'z3-sat-tactic', 'solver': 'z3-tactic'},
+    {'name': 'dpll', 'solver': 'dpll'},
+]
+
+
+def run_config(file_path, config, timeout=None):
+    """Zgjidh file-in me një konfigurim; kthen fjalor me 'config', 'result', 'assignment' dhe 'seconds'."""
+    start = time.perf_counter()
+    num_vars, clauses = read_cnf(file_path)
+    assignment = None
+    if config['solver'] == 'dpll':
+        deadline = None if timeout is None else start + timeout
+        try:
+            assignment = dpll_solve(num_vars, clauses, deadline)
+            result = 'sat' if assignment is not None else 'unsat'
+        except TimeoutError:
+            result = 'unknown'
+    else:
+        solver = Then('simplify', 'sat').solver() if config['solver'] == 'z3-tactic' else Solver()
+        if 'random_seed' in config:
+            solver.set('random_seed', config['random_seed'])
+        if timeout is not None:
+            solver.set('timeout', max(1, int(timeout * 1000)))
+        load_clauses_z3(num_vars, clauses, solver)
+        check = solver.check()
+        result = 'sat' if check == sat else 'unsat' if check == unsat else 'unknown'
+        if check == sat:
+            assignment = extract_assignment(solver.model(), num_vars)
+    return {'config': config['name'], 'result': result, 'assignment': assignment,
+            'seconds': time.perf_counter() - start}
+
+
+def portfolio_task(args):
+    return run_config(*args)
+
+
+def solve_portfolio(file_path, configs=None, timeout=None, workers=None):
+    """Gara e konfigurimeve në një pool procesesh; kthen rezultatin e parë 'sat'/'unsat' (ose 'unknown')."""
+    configs = configs or PORTFOLIO_CONFIGS
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+    tasks = [(file_path, config, timeout) for config in configs]
+    last = {'config': None, 'result': 'unknown', 'assignment': None, 'seconds': 0.0}
+    pool = multiprocessing.Pool(workers)
+    try:
+        for outcome in pool.imap_unordered(portfolio_task, tasks):
+            if outcome['result'] != 'unknown':
+                return outcome
+            last = outcome
+        return last
+    finally:
+        # Konfigurimet që janë ende duke punuar ndalen sapo kemi përgjigje
+        pool.terminate()
+        pool.join()
+
+
+# Zgjidhja në grup: të gjithë file-t .cnf të një direktorie zgjidhen paralelisht me kohë të kufizuar
+# për secilin, dhe rezultatet shkruhen si rreshta JSON sapo mbarojnë.
+def batch_task(args):
+    file_path, timeout, include_model = args
+    try:
+        outcome = run_config(file_path, PORTFOLIO_CONFIGS[0], timeout)
+    except (OSError, ValueError, Z3Exception) as error:
+        return {'file': file_path, 'result': 'error', 'error': str(error)}
+    record = {'file': file_path, 'result': outcome['result'], 'seconds': round(outcome['seconds'], 6)}
+    if include_model and outcome['assignment'] is not None:
+        # Modeli si listë literalesh, si në formatin e zgjidhjeve DIMACS
+        record['model'] = [i + 1 if value else -(i + 1) for i, value in enumerate(outcome['assignment'])]
+    return record
+
+
+def solve_directory(directory, timeout=None, workers=None, output=None, include_model=False):
+    """Zgjidh çdo file .cnf të direktorisë dhe shkruan një rresht JSON për secilin; kthen numrin e file-ve."""
+    output = output or sys.stdout
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.cnf'))
+    tasks = [(path, timeout, include_model) for path in paths]
+    with multiprocessing.Pool(min(workers or os.cpu_count() or 1, max(1, len(tasks)))) as pool:
+        for record in pool.imap_unordered(batch_task, tasks):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    return len(tasks)
+
+
 # Përdorimi i funksioneve
-cnf_file = 'sat_problem.cnf'  # Vendosni rrugën e file-it tuaj CNF
-num_vars, clauses = read_cnf(cnf_file)
-solution = solve_cnf(num_vars, clauses)
-
-if solution:
-    print("Zgjidhja e mundshme është:")
-    for i in range(num_vars):
-        print(f"x{i + 1} = {solution[Bool(f'x{i + 1}')]}")  # Tregon vlerën e secilit variabël
-else:
-    print("Formula nuk ka zgjidhje.")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zgjidh file CNF me z3.")
+    parser.add_argument('cnf_file', nargs='?', default='sat_problem.cnf')  # Vendosni rrugën e file-it tuaj CNF
+    parser.add_argument('--portfolio', action='store_true', help="gara e disa konfigurimeve, fiton përgjigjja e parë")
+    parser.add_argument('--batch', metavar='DIR', help="zgjidh të gjithë file-t .cnf të direktorisë (rreshta JSON)")
+    parser.add_argument('--timeout', type=float, help="sekonda për instancë")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--model', action='store_true', help="përfshi modelin në rreshtat JSON të --batch")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        solve_directory(args.batch, args.timeout, args.workers, include_model=args.model)
+        return
+
+    cnf_file = args.cnf_file
+    num_vars = read_cnf_header(cnf_file)[0]
+    if args.portfolio:
+        outcome = solve_portfolio(cnf_file, timeout=args.timeout, workers=args.workers)
+        print(f"Fitoi konfigurimi {outcome['config']} ({outcome['result']}, {outcome['seconds']:.3f} s)")
+        if outcome['result'] == 'unknown':
+            print("Asnjë konfigurim nuk dha përgjigje brenda kohës.")
+            return
+        solution = outcome['assignment']
+    else:
+        solution = solve_cnf_file(cnf_file)
+
+    if solution is not None:
+        print("Zgjidhja e mundshme është:")
+        for i in range(num_vars):
+            print(f"x{i + 1} = {bool(solution[i])}")  # Tregon vlerën e secilit variabël
+    else:
+        print("Formula nuk ka zgjidhje.")
+
+
+if __name__ == "__main__":
+    main()
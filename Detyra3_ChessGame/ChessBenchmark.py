@@ -0,0 +1,125 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from ChessGame import GameState
+
+# Fixed benchmark positions, written like GameState.board (white moves first in every position)
+BENCHMARK_POSITIONS = {
+    'driver': GameState().board,
+    'start': [
+        ["bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR"],
+        ["bp", "bp", "bp", "bp", "bp", "bp", "bp", "bp"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["wp", "wp", "wp", "wp", "wp", "wp", "wp", "wp"],
+        ["wR", "wN", "wB", "wQ", "wK", "wB", "wN", "wR"],
+    ],
+    'middlegame': [
+        ["bR", "--", "--", "bQ", "--", "bR", "bK", "--"],
+        ["bp", "bp", "--", "bB", "bB", "bp", "bp", "bp"],
+        ["--", "--", "bN", "bp", "--", "bN", "--", "--"],
+        ["--", "--", "bp", "--", "bp", "--", "--", "--"],
+        ["--", "--", "wB", "--", "wp", "--", "--", "--"],
+        ["--", "--", "wN", "wp", "--", "wN", "--", "--"],
+        ["wp", "wp", "wp", "--", "wQ", "wp", "wp", "wp"],
+        ["wR", "--", "wB", "--", "--", "wR", "wK", "--"],
+    ],
+    'endgame': [
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["--", "--", "--", "--", "--", "bp", "bK", "--"],
+        ["--", "--", "bp", "--", "--", "--", "bp", "--"],
+        ["--", "bp", "--", "--", "bR", "--", "--", "--"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+        ["--", "wp", "--", "wR", "--", "--", "wp", "--"],
+        ["wp", "--", "--", "--", "--", "wp", "wK", "--"],
+        ["--", "--", "--", "--", "--", "--", "--", "--"],
+    ],
+}
+
+
+def runPerft(name, board, depth):
+    """Counts perft leaf nodes for every depth up to the given one."""
+    results = []
+    gs = GameState()
+    gs.setBoard(board)
+    for d in range(1, depth + 1):
+        start = time.perf_counter()
+        nodes = gs.perft(d)
+        elapsed = time.perf_counter() - start
+        results.append({'position': name, 'depth': d, 'nodes': nodes, 'seconds': elapsed,
+                        'nps': nodes / elapsed if elapsed > 0 else None})
+    return results
+
+
+def runSearch(name, board, depth, ttSizeMb):
+    """Runs getBestMove at every depth up to the given one, each from a cold transposition table."""
+    results = []
+    for d in range(1, depth + 1):
+        gs = GameState(ttSizeMb=ttSizeMb, collectStats=True)
+        gs.setBoard(board)
+        start = time.perf_counter()
+        bestMove = gs.getBestMove(d)
+        elapsed = time.perf_counter() - start
+        result = {'position': name, 'depth': d, 'nodes': gs.nodesSearched, 'seconds': elapsed,
+                  'nps': gs.nodesSearched / elapsed if elapsed > 0 else None,
+                  'bestMove': bestMove.getChessNotation() if bestMove else None}
+        result.update(gs.searchStats.asDict())
+        results.append(result)
+    return results
+
+
+def printTable(title, rows, columns):
+    print(title)
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            cells.append(f"{value:>12.3f}" if isinstance(value, float) else f"{str(value):>12}")
+        print("  ".join(cells))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft and search benchmarks for the ChessGame engine.")
+    parser.add_argument('--perft-depth', type=int, default=3)
+    parser.add_argument('--search-depth', type=int, default=4)
+    parser.add_argument('--positions', nargs='+', choices=sorted(BENCHMARK_POSITIONS), default=list(BENCHMARK_POSITIONS))
+    parser.add_argument('--tt-size-mb', type=float, default=16)
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    perftResults = []
+    searchResults = []
+    for name in args.positions:
+        perftResults.extend(runPerft(name, BENCHMARK_POSITIONS[name], args.perft_depth))
+        searchResults.extend(runSearch(name, BENCHMARK_POSITIONS[name], args.search_depth, args.tt_size_mb))
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'perft': perftResults,
+        'search': searchResults,
+    }
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return report
+
+    printTable("Perft:", perftResults, ['position', 'depth', 'nodes', 'seconds', 'nps'])
+    printTable("Search:", searchResults,
+               ['position', 'depth', 'nodes', 'cutoffs', 'ttHits', 'evaluations', 'seconds', 'nps', 'bestMove'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,331 @@
+import mmap
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import time
+
+
+def buildLeaperAttacks(offsets):
+    """Precomputes the attack bitboard of a single-step piece (knight, king) for every square."""
+    attacks = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        attackBoard = 0
+        for dr, dc in offsets:
+            endRow, endCol = r + dr, c + dc
+            if 0 <= endRow < 8 and 0 <= endCol < 8:
+                attackBoard |= 1 << (endRow * 8 + endCol)
+        attacks.append(attackBoard)
+    return attacks
+
+
+def buildRays(direction):
+    """Precomputes, for every square, the bitboard of all squares along one direction up to the edge."""
+    rays = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        ray = 0
+        endRow, endCol = r + direction[0], c + direction[1]
+        while 0 <= endRow < 8 and 0 <= endCol < 8:
+            ray |= 1 << (endRow * 8 + endCol)
+            endRow, endCol = endRow + direction[0], endCol + direction[1]
+        rays.append(ray)
+    return rays
+
+
+# Squares are indexed 0..63 row by row, so bit (r * 8 + c) corresponds to board[r][c].
+# Both leaper tables list their offsets in increasing square order, which keeps the
+# generated move order identical to the original square-by-square scan.
+KNIGHT_ATTACKS = buildLeaperAttacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = buildLeaperAttacks([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+# Each sliding direction is stored with a flag telling whether it walks towards higher square indices.
+ROOK_RAYS = [(buildRays(d), d[0] * 8 + d[1] > 0) for d in [(-1, 0), (1, 0), (0, -1), (0, 1)]]
+BISHOP_RAYS = [(buildRays(d), d[0] * 8 + d[1] > 0) for d in [(-1, -1), (-1, 1), (1, -1), (1, 1)]]
+PIECES = [color + pieceType for color in "wb" for pieceType in "pNBRQK"]
+# Pieces are numbered by their position in PIECES (index % 6 gives the type), 12 marks an empty square
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+EMPTY = 12
+PIECE_NAMES = PIECES + ["--"]
+PIECE_INDEX = {name: index for index, name in enumerate(PIECE_NAMES)}
+MAX_MOVES = 256  # Upper bound on pseudo-legal moves in one position, the size of each move buffer
+PIECE_TO_FEN = {piece: piece[1].upper() if piece[0] == 'w' else piece[1].lower() for piece in PIECES}
+FEN_TO_PIECE = {char: piece for piece, char in PIECE_TO_FEN.items()}
+FULL_BOARD = (1 << 64) - 1
+ROW_2 = 0xFF << 16  # Black pawns land here after their first step
+ROW_5 = 0xFF << 40  # White pawns land here after their first step
+
+
+def slidingAttacks(sq, rays, occupied):
+    """Returns the squares a slider on sq reaches along the given rays, blockers included."""
+    attacks = 0
+    for directionRays, ascending in rays:
+        ray = directionRays[sq]
+        blockers = ray & occupied
+        if blockers:
+            blocker = (blockers & -blockers).bit_length() - 1 if ascending else blockers.bit_length() - 1
+            ray ^= directionRays[blocker]
+        attacks |= ray
+    return attacks
+
+
+def buildPieceSquareValues(whiteTable):
+    """Expands a table written from white's point of view (row 0 = 8th rank) into signed values for both colors."""
+    values = {}
+    for pieceType, table in whiteTable.items():
+        values['w' + pieceType] = list(table)
+        values['b' + pieceType] = [-table[sq ^ 56] for sq in range(64)]  # sq ^ 56 mirrors the row
+    return values
+
+
+# Optional positional terms in centipawns (simplified evaluation tables), enabled with usePieceSquareTables
+PIECE_SQUARE_VALUES = buildPieceSquareValues({
+    'p': [0, 0, 0, 0, 0, 0, 0, 0,
+          50, 50, 50, 50, 50, 50, 50, 50,
+          10, 10, 20, 30, 30, 20, 10, 10,
+          5, 5, 10, 25, 25, 10, 5, 5,
+          0, 0, 0, 20, 20, 0, 0, 0,
+          5, -5, -10, 0, 0, -10, -5, 5,
+          5, 10, 10, -20, -20, 10, 10, 5,
+          0, 0, 0, 0, 0, 0, 0, 0],
+    'N': [-50, -40, -30, -30, -30, -30, -40, -50,
+          -40, -20, 0, 0, 0, 0, -20, -40,
+          -30, 0, 10, 15, 15, 10, 0, -30,
+          -30, 5, 15, 20, 20, 15, 5, -30,
+          -30, 0, 15, 20, 20, 15, 0, -30,
+          -30, 5, 10, 15, 15, 10, 5, -30,
+          -40, -20, 0, 5, 5, 0, -20, -40,
+          -50, -40, -30, -30, -30, -30, -40, -50],
+    'B': [-20, -10, -10, -10, -10, -10, -10, -20,
+          -10, 0, 0, 0, 0, 0, 0, -10,
+          -10, 0, 5, 10, 10, 5, 0, -10,
+          -10, 5, 5, 10, 10, 5, 5, -10,
+          -10, 0, 10, 10, 10, 10, 0, -10,
+          -10, 10, 10, 10, 10, 10, 10, -10,
+          -10, 5, 0, 0, 0, 0, 5, -10,
+          -20, -10, -10, -10, -10, -10, -10, -20],
+    'R': [0, 0, 0, 0, 0, 0, 0, 0,
+          5, 10, 10, 10, 10, 10, 10, 5,
+          -5, 0, 0, 0, 0, 0, 0, -5,
+          -5, 0, 0, 0, 0, 0, 0, -5,
+          -5, 0, 0, 0, 0, 0, 0, -5,
+          -5, 0, 0, 0, 0, 0, 0, -5,
+          -5, 0, 0, 0, 0, 0, 0, -5,
+          0, 0, 0, 5, 5, 0, 0, 0],
+    'Q': [-20, -10, -10, -5, -5, -10, -10, -20,
+          -10, 0, 0, 0, 0, 0, 0, -10,
+          -10, 0, 5, 5, 5, 5, 0, -10,
+          -5, 0, 5, 5, 5, 5, 0, -5,
+          0, 0, 5, 5, 5, 5, 0, -5,
+          -10, 5, 5, 5, 5, 5, 0, -10,
+          -10, 0, 5, 0, 0, 0, 0, -10,
+          -20, -10, -10, -5, -5, -10, -10, -20],
+    'K': [-30, -40, -40, -50, -50, -40, -40, -30,
+          -30, -40, -40, -50, -50, -40, -40, -30,
+          -30, -40, -40, -50, -50, -40, -40, -30,
+          -30, -40, -40, -50, -50, -40, -40, -30,
+          -20, -30, -30, -40, -40, -30, -30, -20,
+          -10, -20, -20, -20, -20, -20, -20, -10,
+          20, 20, 0, 0, 0, 0, 20, 20,
+          20, 30, 10, 0, 0, 10, 30, 20],
+})
+
+# Zobrist keys come from a fixed seed so position hashes are identical in every process and run.
+zobristRandom = random.Random(0x5EED)
+ZOBRIST_PIECE_KEYS = {piece: [zobristRandom.getrandbits(64) for _ in range(64)] for piece in PIECES}
+ZOBRIST_BLACK_TO_MOVE = zobristRandom.getrandbits(64)
+# minimax scores depend on which side is maximizing, so that is mixed into the table key as well
+ZOBRIST_MAXIMIZING = zobristRandom.getrandbits(64)
+
+
+class TranspositionTable():
+    """Fixed-size hash table of search results indexed by Zobrist key."""
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+    entryBytes = 200  # Approximate CPython footprint of one stored entry
+
+    def __init__(self, sizeMb=16):
+        entries = max(1, int(sizeMb * 1024 * 1024) // self.entryBytes)
+        self.size = 1 << (entries.bit_length() - 1)  # Round down to a power of two so a mask replaces modulo
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        """Returns (key, depth, score, flag, bestMoveID, generation) for the key, or None."""
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, bestMoveID):
+        """Stores a result, keeping a deeper entry from the current search over a shallower one."""
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[index] = (key, depth, score, flag, bestMoveID, self.generation)
+
+    def newSearch(self):
+        """Ages existing entries so the next search may overwrite them freely."""
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.generation = 0
+
+
+class PersistentCache():
+    """On-disk cache of root search results keyed by Zobrist hash, shared through mmap.
+
+    The file is a header followed by buckets of BUCKET_SLOTS fixed-size records, so its size
+    (set by sizeMb when the file is created) is the cache's hard limit. A full bucket evicts the
+    shallowest record, preferring records written by earlier sessions. Several processes may map
+    the same file: records are stored with their key XORed into the data, so a half-written
+    record from a concurrent writer reads as a miss instead of a wrong result.
+    """
+    MAGIC = b'CGCACHE1'
+    HEADER = struct.Struct('<8sII')  # magic, bucket count, session generation
+    RECORD = struct.Struct('<QQQ')  # key ^ scoreBits ^ meta, scoreBits, meta
+    DOUBLE = struct.Struct('<d')
+    BITS = struct.Struct('<Q')
+    BUCKET_SLOTS = 4
+    VALID = 1 << 63
+
+    def __init__(self, path, sizeMb=64, readOnly=False, newSession=True):
+        self.readOnly = readOnly
+        bucketBytes = self.RECORD.size * self.BUCKET_SLOTS
+        if not readOnly:
+            self.create(path, sizeMb, bucketBytes)
+        elif not os.path.exists(path):
+            raise FileNotFoundError(f"No cache file at {path}")
+        self.file = open(path, 'rb' if readOnly else 'r+b')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ if readOnly else mmap.ACCESS_WRITE)
+        except ValueError:  # Empty file
+            self.file.close()
+            raise ValueError(f"{path} is not a ChessGame cache file")
+        magic, self.buckets, generation = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or len(self.map) < self.HEADER.size + self.buckets * bucketBytes:
+            self.close()
+            raise ValueError(f"{path} is not a ChessGame cache file")
+        self.mask = self.buckets - 1
+        self.generation = generation
+        if not readOnly and newSession:
+            # Every writing session gets a new generation so its records outrank older ones;
+            # pool workers pass newSession=False to share the session their parent started
+            self.generation = (generation + 1) & 0xFFFF
+            self.HEADER.pack_into(self.map, 0, self.MAGIC, self.buckets, self.generation)
+
+    def create(self, path, sizeMb, bucketBytes):
+        """Creates the cache file unless it already exists.
+
+        The file is written in full under a temporary name and then hard-linked to path, which
+        fails if path exists. Of several processes opening a new path exactly one creates it,
+        and no process can map a file that is still being sized or is truncated under it.
+        """
+        if os.path.exists(path):
+            return
+        buckets = max(1, int(sizeMb * 1024 * 1024) // bucketBytes)
+        buckets = 1 << (buckets.bit_length() - 1)
+        tempPath = f"{path}.{os.getpid()}.tmp"
+        with open(tempPath, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, buckets, 0))
+            f.truncate(self.HEADER.size + buckets * bucketBytes)
+        try:
+            os.link(tempPath, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tempPath)
+
+    def slotOffsets(self, key):
+        bucketStart = self.HEADER.size + (key & self.mask) * self.RECORD.size * self.BUCKET_SLOTS
+        return range(bucketStart, bucketStart + self.RECORD.size * self.BUCKET_SLOTS, self.RECORD.size)
+
+    def probe(self, key):
+        """Returns (depth, score, flag, bestMoveID) stored for the key, or None."""
+        for offset in self.slotOffsets(key):
+            check, scoreBits, meta = self.RECORD.unpack_from(self.map, offset)
+            if meta & self.VALID and check ^ scoreBits ^ meta == key:
+                moveID = (meta >> 10 & 0x1FFF) - 1
+                return (meta & 0xFF, self.DOUBLE.unpack(self.BITS.pack(scoreBits))[0], meta >> 8 & 3,
+                        moveID if moveID >= 0 else None)
+        return None
+
+    def store(self, key, depth, score, flag, bestMoveID):
+        """Writes a result unless the cache already holds a deeper one for the key."""
+        if self.readOnly:
+            return
+        victim = None
+        victimRank = None
+        for offset in self.slotOffsets(key):
+            check, scoreBits, meta = self.RECORD.unpack_from(self.map, offset)
+            if not meta & self.VALID:
+                victim = offset
+                break
+            if check ^ scoreBits ^ meta == key:
+                if meta & 0xFF > depth:
+                    return
+                victim = offset
+                break
+            rank = (meta & 0xFF) + (256 if meta >> 32 & 0xFFFF == self.generation else 0)
+            if victimRank is None or rank < victimRank:
+                victim, victimRank = offset, rank
+        scoreBits = self.BITS.unpack(self.DOUBLE.pack(score))[0]
+        meta = (self.VALID | self.generation << 32 | ((bestMoveID + 1) if bestMoveID is not None else 0) << 10
+                | flag << 8 | min(depth, 0xFF))
+        self.RECORD.pack_into(self.map, victim, key ^ scoreBits ^ meta, scoreBits, meta)
+
+    def flush(self):
+        if not self.readOnly:
+            self.map.flush()
+
+    def close(self):
+        if not self.map.closed:
+            self.flush()
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the deadline of a time-bounded search has passed."""
+
+
+class SearchStats():
+    """Optional search counters, only updated when GameState is created with collectStats=True."""
+
+    def __init__(self):
+        self.cutoffs = 0  # Beta cutoffs in minimax
+        self.ttHits = 0  # Transposition table probes that answered the node without searching it
+        self.evaluations = 0  # Leaf positions passed to evaluate()
+
+    def reset(self):
+        self.__init__()
+
+    def asDict(self):
+        return {'cutoffs': self.cutoffs, 'ttHits': self.ttHits, 'evaluations': self.evaluations}
+
+
+class SearchResult():
+    """Outcome of an iterative deepening search: the last fully completed iteration plus totals."""
+
+    def __init__(self, bestMove, score, depth, nodes, elapsed, principalVariation):
+        self.bestMove = bestMove
+        self.score = score
+        self.depth = depth  # Deepest iteration that finished before the deadline
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.principalVariation = principalVariation
+
+
 class GameState():
     pieceScores = {
         'p': 1,  # Pawn
@@ -8,7 +336,8 @@ class GameState():
         'K': 1000  # King (assign an arbitrarily high value to ensure safety)
     }
 
-    def __init__(self):
+    def __init__(self, ttSizeMb=16, usePieceSquareTables=False, moveOrdering=None, collectStats=False,
+                 persistentCache=None):
         self.board = [
             ["bR", "--", "bB", "bQ", "bK", "--", "bN", "bR"],
             ["bp", "bp", "bp", "--", "--", "bp", "bp", "bp"],
@@ -21,57 +350,196 @@ class GameState():
         ]
         self.whiteToMove = True
         self.moveLog = []
+        self.fullmoveNumber = 1  # Move number of the position the move log starts from
         self.checkmate = False
         self.stalemate = False
+        self.usePieceSquareTables = usePieceSquareTables
+        self.ttSizeMb = ttSizeMb
+        self.transpositionTable = TranspositionTable(ttSizeMb)
+        self.moveOrdering = moveOrdering if moveOrdering is not None else HeuristicMoveOrdering()
+        self.nodesSearched = 0
+        self.searchStats = SearchStats() if collectStats else None  # None keeps the counters off the hot path
+        self.deadline = None  # perf_counter() value after which a timed search stops
+        self.lastSearchResult = None
+        self.persistentCache = persistentCache  # Optional PersistentCache consulted before root searches
+        self.moveBuffers = []  # One preallocated code buffer per remaining search depth
+        self.captureCount = 0  # Captures written by the last generateMoves call
+        self.loadBitboards()
+
+    def loadBitboards(self):
+        """Rebuilds the bitboards and running evaluation terms from self.board (call after editing the board by hand)."""
+        self.pieceBitboards = {piece: 0 for piece in PIECES}
+        self.colorBitboards = {'w': 0, 'b': 0}
+        self.zobristKey = 0 if self.whiteToMove else ZOBRIST_BLACK_TO_MOVE
+        # Material is kept in integer centipawns so make/undo never accumulates rounding error
+        self.pieceValues = {piece: round(self.pieceScores[piece[1]] * 100) * (1 if piece[0] == 'w' else -1)
+                            for piece in PIECES}
+        self.materialBalance = 0
+        self.positionalBalance = 0
+        self.kingSquares = {'w': None, 'b': None}
+        self.squares = [PIECE_INDEX[piece] for row in self.board for piece in row]
+        for r in range(8):
+            for c in range(8):
+                piece = self.board[r][c]
+                if piece != "--":
+                    sq = r * 8 + c
+                    self.pieceBitboards[piece] |= 1 << sq
+                    self.colorBitboards[piece[0]] |= 1 << sq
+                    self.zobristKey ^= ZOBRIST_PIECE_KEYS[piece][sq]
+                    self.materialBalance += self.pieceValues[piece]
+                    self.positionalBalance += PIECE_SQUARE_VALUES[piece][sq]
+                    if piece[1] == 'K':
+                        self.kingSquares[piece[0]] = sq
 
     def evaluate(self):
         """Evaluates the game state based on material and mobility."""
-        materialScore = 0
-        mobilityScore = 0
-        kingSafetyScore = 0
-        moves = self.getAllPossibleMoves()
-        for row in self.board:
-            for square in row:
-                if square != "--":
-                    pieceType = square[1]
-                    pieceScore = self.pieceScores[pieceType]
-                    if square[0] == 'w':
-                        materialScore += pieceScore
-                    else:
-                        materialScore -= pieceScore
+        materialScore = self.materialBalance / 100
 
         # Additional bonus for mobility
-        mobilityScore = len(moves) if self.whiteToMove else -len(moves)
+        mobility = self.countMoves()
+        mobilityScore = mobility if self.whiteToMove else -mobility
 
         # Penalize if king is in unsafe position
         kingSafetyScore = self.evaluateKingSafety()
 
-        return materialScore + 0.1 * mobilityScore + kingSafetyScore
+        score = materialScore + 0.1 * mobilityScore + kingSafetyScore
+        if self.usePieceSquareTables:
+            score += self.positionalBalance / 100
+        return score
 
     def evaluateKingSafety(self):
         """Evaluates king safety based on surrounding squares."""
-        safetyScore = 0
-        kingPosition = self.findKing('w' if self.whiteToMove else 'b')
-        if kingPosition:
-            row, col = kingPosition
-            directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-            for d in directions:
-                r, c = row + d[0], col + d[1]
-                if 0 <= r < 8 and 0 <= c < 8:
-                    piece = self.board[r][c]
-                    if piece == "--":
-                        safetyScore -= 0.05  # Penalize open squares near the king
-                    elif piece[0] == ('w' if self.whiteToMove else 'b'):
-                        safetyScore += 0.1  # Bonus for protected squares
-        return safetyScore
+        allyColor = 'w' if self.whiteToMove else 'b'
+        kingSquare = self.kingSquares[allyColor]
+        if kingSquare is None:
+            return 0
+        neighbours = KING_ATTACKS[kingSquare]
+        empty = ~(self.colorBitboards['w'] | self.colorBitboards['b'])
+        # Penalize open squares near the king, bonus for protected squares
+        return -0.05 * (neighbours & empty).bit_count() + 0.1 * (neighbours & self.colorBitboards[allyColor]).bit_count()
 
     def findKing(self, color):
-        for r in range(len(self.board)):
-            for c in range(len(self.board[r])):
-                if self.board[r][c] == f"{color}K":
-                    return (r, c)
+        kingSquare = self.kingSquares[color]
+        if kingSquare is not None:
+            return divmod(kingSquare, 8)
         return None
 
+    def countMoves(self):
+        """Counts the moves getAllPossibleMoves would generate, without building Move objects."""
+        allyColor, enemyColor = ('w', 'b') if self.whiteToMove else ('b', 'w')
+        allies = self.colorBitboards[allyColor]
+        occupied = allies | self.colorBitboards[enemyColor]
+        empty = ~occupied & FULL_BOARD
+        count = 0
+
+        pawns = self.pieceBitboards[allyColor + 'p']
+        if self.whiteToMove:
+            singlePushes = (pawns >> 8) & empty
+            count += singlePushes.bit_count() + ((singlePushes & ROW_5) >> 8 & empty).bit_count()
+        else:
+            singlePushes = (pawns << 8) & empty
+            count += singlePushes.bit_count() + ((singlePushes & ROW_2) << 8 & empty).bit_count()
+
+        for pieceType, attackTable in (('N', KNIGHT_ATTACKS), ('K', KING_ATTACKS)):
+            pieces = self.pieceBitboards[allyColor + pieceType]
+            while pieces:
+                lowestBit = pieces & -pieces
+                pieces ^= lowestBit
+                count += (attackTable[lowestBit.bit_length() - 1] & ~allies).bit_count()
+
+        queens = self.pieceBitboards[allyColor + 'Q']
+        for pieces, rays in ((self.pieceBitboards[allyColor + 'R'] | queens, ROOK_RAYS),
+                             (self.pieceBitboards[allyColor + 'B'] | queens, BISHOP_RAYS)):
+            while pieces:
+                lowestBit = pieces & -pieces
+                pieces ^= lowestBit
+                count += (slidingAttacks(lowestBit.bit_length() - 1, rays, occupied) & ~allies).bit_count()
+        return count
+
+    def setBoard(self, board, whiteToMove=True):
+        """Replaces the position with a copy of an 8x8 board like self.board and clears the move log."""
+        self.board = [list(row) for row in board]
+        self.whiteToMove = whiteToMove
+        self.moveLog = []
+        self.fullmoveNumber = 1
+        self.loadBitboards()
+
+    @classmethod
+    def fromFen(cls, fen, **kwargs):
+        """Creates a GameState (constructor options in kwargs) set up from a FEN string."""
+        gs = cls(**kwargs)
+        gs.loadFen(fen)
+        return gs
+
+    def loadFen(self, fen):
+        """Sets up the position from a FEN string.
+
+        Castling and en passant fields are accepted but ignored, since the engine does not play
+        those moves. Raises ValueError for a malformed placement or side to move.
+        """
+        fields = fen.split()
+        if len(fields) < 2:
+            raise ValueError(f"FEN needs at least piece placement and side to move: {fen!r}")
+        ranks = fields[0].split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"FEN piece placement must have 8 ranks: {fen!r}")
+        board = []
+        for rank in ranks:
+            row = []
+            for char in rank:
+                if char.isdigit():
+                    row.extend(["--"] * int(char))
+                elif char in FEN_TO_PIECE:
+                    row.append(FEN_TO_PIECE[char])
+                else:
+                    raise ValueError(f"Unknown piece {char!r} in FEN: {fen!r}")
+            if len(row) != 8:
+                raise ValueError(f"FEN rank {rank!r} does not describe 8 squares")
+            board.append(row)
+        if fields[1] not in ('w', 'b'):
+            raise ValueError(f"FEN side to move must be 'w' or 'b': {fen!r}")
+        self.setBoard(board, fields[1] == 'w')
+        if len(fields) >= 6 and fields[5].isdigit():
+            self.fullmoveNumber = int(fields[5])
+
+    def toFen(self):
+        """Returns the FEN of the current position (no castling or en passant rights, halfmove clock 0)."""
+        ranks = []
+        for row in self.board:
+            rank = ""
+            emptyCount = 0
+            for piece in row:
+                if piece == "--":
+                    emptyCount += 1
+                    continue
+                if emptyCount:
+                    rank += str(emptyCount)
+                    emptyCount = 0
+                rank += PIECE_TO_FEN[piece]
+            if emptyCount:
+                rank += str(emptyCount)
+            ranks.append(rank)
+        startedWithWhite = self.whiteToMove == (len(self.moveLog) % 2 == 0)
+        fullmove = self.fullmoveNumber + (len(self.moveLog) + (0 if startedWithWhite else 1)) // 2
+        return f"{'/'.join(ranks)} {'w' if self.whiteToMove else 'b'} - - 0 {fullmove}"
+
+    def perft(self, depth):
+        """Counts the leaf nodes of the move tree to the given depth (move generator check and benchmark)."""
+        if depth == 0:
+            return 1
+        while len(self.moveBuffers) <= depth:
+            self.moveBuffers.append([0] * MAX_MOVES)
+        moves = self.moveBuffers[depth]
+        moveCount = self.generateMoves(moves)
+        if depth == 1:
+            return moveCount
+        nodes = 0
+        for i in range(moveCount):
+            self.makeMoveCode(moves[i])
+            nodes += self.perft(depth - 1)
+            self.undoMove()
+        return nodes
+
     def printBoard(self):
         for row in self.board:
             print(' '.join(row))
@@ -79,195 +547,819 @@ class GameState():
 
     def minimax(self, depth, alpha, beta, maximizingPlayer):
         """MiniMax algorithm with Alpha-Beta pruning."""
-        if depth == 0 or self.checkmate or self.stalemate:
+        self.nodesSearched += 1
+        if self.deadline is not None and self.nodesSearched & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.checkmate or self.stalemate:
             return self.evaluate()
 
-        moves = self.getValidMoves()
+        key = self.zobristKey ^ ZOBRIST_MAXIMIZING if maximizingPlayer else self.zobristKey
+        entry = self.transpositionTable.probe(key)
+        stats = self.searchStats
+        if depth == 0:
+            # Leaf evaluations are cached as well, since they generate every move of the position
+            if entry is not None and entry[3] == TranspositionTable.EXACT:
+                if stats is not None:
+                    stats.ttHits += 1
+                return entry[2]
+            if stats is not None:
+                stats.evaluations += 1
+            score = self.evaluate()
+            if entry is None:
+                self.transpositionTable.store(key, 0, score, TranspositionTable.EXACT, None)
+            return score
+        if entry is not None and entry[1] >= depth:
+            score, flag = entry[2], entry[3]
+            if flag == TranspositionTable.EXACT:
+                if stats is not None:
+                    stats.ttHits += 1
+                return score
+            if flag == TranspositionTable.LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                if stats is not None:
+                    stats.ttHits += 1
+                return score
 
-        if not moves:
+        # Moves are generated as packed codes into this depth's buffer instead of new Move objects
+        while len(self.moveBuffers) <= depth:
+            self.moveBuffers.append([0] * MAX_MOVES)
+        moves = self.moveBuffers[depth]
+        moveCount = self.generateMoves(moves)
+
+        if not moveCount:
             if self.checkmate:
                 return float('-inf') if maximizingPlayer else float('inf')
             return 0  # Stalemate
 
+        # The best move of an earlier (usually shallower) search of this position is tried first
+        self.moveOrdering.orderMoves(self, moves, moveCount, entry[4] if entry is not None else None)
+
+        # Bounds of the window actually searched, used to classify the stored score
+        windowAlpha, windowBeta = alpha, beta
+        bestMoveID = None
         if maximizingPlayer:
             maxEval = float('-inf')
-            for move in moves:
-                self.makeMove(move)
+            for i in range(moveCount):
+                code = moves[i]
+                self.makeMoveCode(code)
                 evaluation = self.minimax(depth - 1, alpha, beta, False)
                 self.undoMove()
-                maxEval = max(maxEval, evaluation)
+                if evaluation > maxEval:
+                    maxEval = evaluation
+                    bestMoveID = code & MOVE_ID_MASK
                 alpha = max(alpha, evaluation)
                 if beta <= alpha:
+                    self.moveOrdering.recordCutoff(self, code, depth)
+                    if stats is not None:
+                        stats.cutoffs += 1
                     break
-            return maxEval
+            bestEval = maxEval
         else:
             minEval = float('inf')
-            for move in moves:
-                self.makeMove(move)
+            for i in range(moveCount):
+                code = moves[i]
+                self.makeMoveCode(code)
                 evaluation = self.minimax(depth - 1, alpha, beta, True)
                 self.undoMove()
-                minEval = min(minEval, evaluation)
+                if evaluation < minEval:
+                    minEval = evaluation
+                    bestMoveID = code & MOVE_ID_MASK
                 beta = min(beta, evaluation)
                 if beta <= alpha:
+                    self.moveOrdering.recordCutoff(self, code, depth)
+                    if stats is not None:
+                        stats.cutoffs += 1
                     break
-            return minEval
+            bestEval = minEval
+
+        if bestEval <= windowAlpha:
+            flag = TranspositionTable.UPPER_BOUND
+        elif bestEval >= windowBeta:
+            flag = TranspositionTable.LOWER_BOUND
+        else:
+            flag = TranspositionTable.EXACT
+        self.transpositionTable.store(key, depth, bestEval, flag, bestMoveID)
+        return bestEval
+
+    def getBestMove(self, depth, timeLimit=None, workers=None):
+        """Finds the best move for the side to move using MiniMax with Alpha-Beta pruning.
+
+        Every mode searches from the same root perspective: white maximizes the evaluation and
+        black minimizes it, so the returned move is the best one for whoever is to move.
+        With a timeLimit (seconds) the search deepens iteratively up to depth instead; details of
+        that search are kept in self.lastSearchResult. With workers > 1 the root moves are
+        searched in parallel by analyzeRootMoves.
+        """
+        if workers is not None and workers > 1 and timeLimit is None:
+            # Moves cut off by the shared bound only carry a bound, so the best move is picked among exact scores
+            ranking = [(move, evaluation) for move, evaluation, exact in self.searchRootMoves(depth, workers, topN=1)
+                       if exact]
+            if not ranking:
+                print("No valid moves available!")
+                return None
+            pick = max if self.whiteToMove else min
+            return pick(ranking, key=lambda x: x[1])[0]
+
+        if timeLimit is not None:
+            self.lastSearchResult = self.iterativeDeepening(timeLimit, maxDepth=depth)
+            if self.lastSearchResult.bestMove is None:
+                print("No valid moves available!")
+            return self.lastSearchResult.bestMove
+
+        maximizingPlayer = self.whiteToMove
+        cached = self.probePersistentCache(depth, maximizingPlayer)
+        if cached is not None:
+            return cached[0]
 
-    def getBestMove(self, depth):
-        """Finds the best move using MiniMax with Alpha-Beta pruning."""
-        bestMove = None
-        maxEval = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
         validMoves = self.getValidMoves()
+        self.transpositionTable.newSearch()
+        self.moveOrdering.newSearch()
 
         if not validMoves:
             print("No valid moves available!")
             return None
 
-        for move in validMoves:
+        bestMove, bestEval = self.searchRoot(validMoves, depth, maximizingPlayer)
+        self.storePersistentCache(depth, maximizingPlayer, bestMove, bestEval)
+        return bestMove
+
+    def probePersistentCache(self, depth, maximizingPlayer):
+        """Returns (move, score, cachedDepth) if the persistent cache holds a root search at least depth deep."""
+        if self.persistentCache is None:
+            return None
+        entry = self.persistentCache.probe(self.zobristKey ^ ZOBRIST_MAXIMIZING if maximizingPlayer else self.zobristKey)
+        if entry is None or entry[0] < depth or entry[3] is None:
+            return None
+        move = next((m for m in self.getValidMoves() if m.moveID == entry[3]), None)
+        return (move, entry[1], entry[0]) if move is not None else None
+
+    def storePersistentCache(self, depth, maximizingPlayer, bestMove, score):
+        if self.persistentCache is not None and bestMove is not None:
+            key = self.zobristKey ^ ZOBRIST_MAXIMIZING if maximizingPlayer else self.zobristKey
+            self.persistentCache.store(key, depth, score, TranspositionTable.EXACT, bestMove.moveID)
+
+    def analyzeRootMoves(self, depth, workers=None, topN=None):
+        """Evaluates every root move to the given depth, spreading the root moves over a process pool.
+
+        Returns [(move, evaluation), ...] in generation order, like the driver loop builds it. With
+        topN, the Nth best exact score found so far is shared with the workers as an alpha (beta
+        for black) bound, so moves that cannot reach the top N are cut off early and only carry
+        a bound. Sorting the list by evaluation still yields the exact top N ranking.
+        """
+        return [(move, evaluation) for move, evaluation, _ in self.searchRootMoves(depth, workers, topN)]
+
+    def searchRootMoves(self, depth, workers=None, topN=None):
+        """Does the work of analyzeRootMoves; returns [(move, evaluation, exact), ...] in generation order."""
+        workers = workers or os.cpu_count() or 1
+        maximizingPlayer = self.whiteToMove
+        moves = self.getValidMoves()
+        sharedBound = multiprocessing.Value('d', float('-inf') if maximizingPlayer else float('inf'))
+        evaluations = [None] * len(moves)
+        exactFlags = [True] * len(moves)
+        topScores = []
+
+        def record(index, evaluation, exact):
+            evaluations[index] = evaluation
+            exactFlags[index] = exact
+            if topN and exact:
+                topScores.append(evaluation)
+                topScores.sort(reverse=maximizingPlayer)
+                del topScores[topN:]
+                if len(topScores) == topN:
+                    sharedBound.value = topScores[-1]
+
+        if workers == 1 or len(moves) < 2:
+            for index, move in enumerate(moves):
+                record(index, *searchRootMove(self, move, depth, maximizingPlayer, sharedBound.value))
+        else:
+            tasks = [(index, move.code, depth, maximizingPlayer) for index, move in enumerate(moves)]
+            initArgs = (self.board, self.whiteToMove, sharedBound,
+                        {'ttSizeMb': self.ttSizeMb, 'usePieceSquareTables': self.usePieceSquareTables,
+                         'moveOrdering': self.moveOrdering})
+            with multiprocessing.Pool(min(workers, len(moves)), initializer=initRootWorker, initargs=initArgs) as pool:
+                # chunksize=1 so every task starts with the latest shared bound
+                for index, evaluation, exact in pool.imap_unordered(rootMoveTask, tasks, chunksize=1):
+                    record(index, evaluation, exact)
+
+        return list(zip(moves, evaluations, exactFlags))
+
+    def iterativeDeepening(self, timeLimit, maxDepth=64):
+        """Searches depth 1, 2, ... until timeLimit seconds pass and returns the last completed iteration.
+
+        Depth 1 always completes. Each iteration searches the previous best move first and the
+        transposition table hands the rest of the principal variation to minimax. A persistent
+        cache entry of at least maxDepth is returned without searching; a shallower one is still
+        used if it is deeper than what the time budget allowed.
+        """
+        start = time.perf_counter()
+        self.nodesSearched = 0
+        maximizingPlayer = self.whiteToMove
+        cached = self.probePersistentCache(1, maximizingPlayer)
+        if cached is not None and cached[2] >= maxDepth:
+            return SearchResult(cached[0], cached[1], cached[2], 0, time.perf_counter() - start, [cached[0]])
+
+        self.transpositionTable.newSearch()
+        self.moveOrdering.newSearch()
+        rootMoves = self.getValidMoves()
+        rootPly = len(self.moveLog)
+        result = SearchResult(None, None, 0, 0, 0.0, [])
+
+        try:
+            for depth in range(1, maxDepth + 1):
+                if not rootMoves:
+                    break
+                bestMove, bestEval = self.searchRoot(rootMoves, depth, maximizingPlayer)
+                result = SearchResult(bestMove, bestEval, depth, self.nodesSearched,
+                                      time.perf_counter() - start,
+                                      self.getPrincipalVariation(bestMove, depth, maximizingPlayer))
+                rootMoves.remove(bestMove)
+                rootMoves.insert(0, bestMove)
+                # Only later iterations may be cut short, so there is always a completed result
+                self.deadline = start + timeLimit
+        except SearchTimeout:
+            while len(self.moveLog) > rootPly:
+                self.undoMove()
+        finally:
+            self.deadline = None
+
+        if cached is not None and cached[2] > result.depth:
+            result = SearchResult(cached[0], cached[1], cached[2], 0, 0.0, [cached[0]])
+        else:
+            self.storePersistentCache(result.depth, maximizingPlayer, result.bestMove, result.score)
+        result.nodes = self.nodesSearched
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def searchRoot(self, moves, depth, maximizingPlayer):
+        """Searches the root moves in order with a narrowing window; returns (bestMove, bestEval)."""
+        alpha = float('-inf')
+        beta = float('inf')
+        bestMove = None
+        bestEval = float('-inf') if maximizingPlayer else float('inf')
+        for move in moves:
             self.makeMove(move)
-            evaluation = self.minimax(depth - 1, alpha, beta, False)
+            evaluation = self.minimax(depth - 1, alpha, beta, not maximizingPlayer)
             self.undoMove()
-            if evaluation > maxEval:
-                maxEval = evaluation
+            if maximizingPlayer and evaluation > bestEval:
+                bestEval = evaluation
+                bestMove = move
+                alpha = max(alpha, evaluation)
+            elif not maximizingPlayer and evaluation < bestEval:
+                bestEval = evaluation
                 bestMove = move
+                beta = min(beta, evaluation)
+        if bestMove is None:
+            bestMove = moves[0]
+        return bestMove, bestEval
 
-        return bestMove
+    def getPrincipalVariation(self, rootMove, depth, maximizingPlayer):
+        """Plays rootMove and follows the transposition table's best moves from there."""
+        variation = [rootMove]
+        self.makeMove(rootMove)
+        maximizingPlayer = not maximizingPlayer
+        for _ in range(depth - 1):
+            key = self.zobristKey ^ ZOBRIST_MAXIMIZING if maximizingPlayer else self.zobristKey
+            entry = self.transpositionTable.probe(key)
+            if entry is None or entry[4] is None:
+                break
+            move = next((m for m in self.getValidMoves() if m.moveID == entry[4]), None)
+            if move is None:
+                break
+            variation.append(move)
+            self.makeMove(move)
+            maximizingPlayer = not maximizingPlayer
+        for _ in variation:
+            self.undoMove()
+        return variation
 
     def makeMove(self, move):
         """Executes a move."""
-        self.board[move.startRow][move.startCol] = "--"
-        self.board[move.endRow][move.endCol] = move.pieceMoved
-        self.moveLog.append(move)
+        self.makeMoveCode(move.code)
+
+    def makeMoveCode(self, code):
+        """Executes a move given as a packed code (see Move); the code is what moveLog records."""
+        startSq = code & 63
+        endSq = code >> 6 & 63
+        pieceMoved = PIECE_NAMES[code >> 12 & 15]
+        pieceCaptured = PIECE_NAMES[code >> 16 & 15]
+        self.squares[startSq] = EMPTY
+        self.squares[endSq] = code >> 12 & 15
+        self.board[startSq >> 3][startSq & 7] = "--"
+        self.board[endSq >> 3][endSq & 7] = pieceMoved
+        self.updateBitboards(startSq, endSq, pieceMoved, pieceCaptured)
+        self.updateEvaluationTerms(startSq, endSq, pieceMoved, pieceCaptured, 1)
+        self.moveLog.append(code)
         self.whiteToMove = not self.whiteToMove
+        self.zobristKey ^= ZOBRIST_BLACK_TO_MOVE
 
     def undoMove(self):
         """Undoes the last move."""
         if len(self.moveLog) != 0:
-            move = self.moveLog.pop()
-            self.board[move.startRow][move.startCol] = move.pieceMoved
-            self.board[move.endRow][move.endCol] = move.pieceCaptured
+            code = self.moveLog.pop()
+            startSq = code & 63
+            endSq = code >> 6 & 63
+            pieceMoved = PIECE_NAMES[code >> 12 & 15]
+            pieceCaptured = PIECE_NAMES[code >> 16 & 15]
+            self.squares[startSq] = code >> 12 & 15
+            self.squares[endSq] = code >> 16 & 15
+            self.board[startSq >> 3][startSq & 7] = pieceMoved
+            self.board[endSq >> 3][endSq & 7] = pieceCaptured
+            self.updateBitboards(startSq, endSq, pieceMoved, pieceCaptured)
+            self.updateEvaluationTerms(startSq, endSq, pieceMoved, pieceCaptured, -1)
             self.whiteToMove = not self.whiteToMove
+            self.zobristKey ^= ZOBRIST_BLACK_TO_MOVE
+
+    def updateEvaluationTerms(self, startSq, endSq, pieceMoved, pieceCaptured, direction):
+        """Applies (direction=1) or reverts (direction=-1) a move's effect on the running evaluation terms."""
+        squareValues = PIECE_SQUARE_VALUES[pieceMoved]
+        positionalChange = squareValues[endSq] - squareValues[startSq]
+        if pieceCaptured != "--":
+            self.materialBalance -= direction * self.pieceValues[pieceCaptured]
+            positionalChange -= PIECE_SQUARE_VALUES[pieceCaptured][endSq]
+            if pieceCaptured[1] == 'K':
+                self.kingSquares[pieceCaptured[0]] = None if direction == 1 else endSq
+        self.positionalBalance += direction * positionalChange
+        if pieceMoved[1] == 'K':
+            self.kingSquares[pieceMoved[0]] = endSq if direction == 1 else startSq
+
+    def updateBitboards(self, startSq, endSq, pieceMoved, pieceCaptured):
+        """Toggles the bits and Zobrist keys touched by a move; applying it twice restores the previous position."""
+        startBit = 1 << startSq
+        endBit = 1 << endSq
+        pieceKeys = ZOBRIST_PIECE_KEYS[pieceMoved]
+        self.pieceBitboards[pieceMoved] ^= startBit | endBit
+        self.colorBitboards[pieceMoved[0]] ^= startBit | endBit
+        self.zobristKey ^= pieceKeys[startSq] ^ pieceKeys[endSq]
+        if pieceCaptured != "--":
+            self.pieceBitboards[pieceCaptured] ^= endBit
+            self.colorBitboards[pieceCaptured[0]] ^= endBit
+            self.zobristKey ^= ZOBRIST_PIECE_KEYS[pieceCaptured][endSq]
 
     def getValidMoves(self):
         """Generates valid moves."""
-        moves = self.getAllPossibleMoves()
-        moves.sort(key=lambda move: self.pieceScores.get(move.pieceCaptured[1], 0), reverse=True)
-        return moves
+        moves = [0] * MAX_MOVES
+        moveCount = self.generateOrderedMoves(moves)
+        return [Move.fromCode(code) for code in moves[:moveCount]]
+
+    def generateOrderedMoves(self, moves):
+        """Fills the buffer like generateMoves, with captures of the most valuable pieces first."""
+        moveCount = self.generateMoves(moves)
+        if self.captureCount:
+            moves[:moveCount] = sorted(moves[:moveCount], key=captureOrderKey, reverse=True)
+        return moveCount
 
     def getAllPossibleMoves(self):
         """Generates all possible moves without checks."""
-        moves = []
-        for r in range(len(self.board)):
-            for c in range(len(self.board[r])):
-                piece = self.board[r][c]
-                if piece != "--" and (
-                        (piece[0] == 'w' and self.whiteToMove) or (piece[0] == 'b' and not self.whiteToMove)):
-                    self.addPieceMoves(r, c, moves)
-        return moves
+        moves = [0] * MAX_MOVES
+        moveCount = self.generateMoves(moves)
+        return [Move.fromCode(code) for code in moves[:moveCount]]
+
+    def generateMoves(self, moves):
+        """Writes the codes of all possible moves (without checks) into a preallocated buffer and returns their count."""
+        self.captureCount = 0
+        moveCount = 0
+        pieces = self.colorBitboards['w' if self.whiteToMove else 'b']
+        while pieces:
+            lowestBit = pieces & -pieces
+            pieces ^= lowestBit
+            moveCount = self.addPieceCodes(lowestBit.bit_length() - 1, moves, moveCount)
+        return moveCount
+
+    def addPieceCodes(self, sq, moves, moveCount):
+        """Writes the codes of the piece on sq from index moveCount on; returns the new count."""
+        pieceType = self.squares[sq] % 6
+        if pieceType == PAWN:
+            return self.addPawnCodes(sq, moves, moveCount)
+        elif pieceType == ROOK:
+            return self.addRookCodes(sq, moves, moveCount)
+        elif pieceType == KNIGHT:
+            return self.addKnightCodes(sq, moves, moveCount)
+        elif pieceType == BISHOP:
+            return self.addBishopCodes(sq, moves, moveCount)
+        elif pieceType == QUEEN:
+            return self.addQueenCodes(sq, moves, moveCount)
+        return self.addKingCodes(sq, moves, moveCount)
+
+    def addTargetCodes(self, sq, targets, moves, moveCount, ascending=True):
+        """Writes a move code from sq to every square set in the targets bitboard."""
+        squares = self.squares
+        base = sq | squares[sq] << 12
+        while targets:
+            if ascending:
+                lowestBit = targets & -targets
+                targets ^= lowestBit
+                endSq = lowestBit.bit_length() - 1
+            else:
+                endSq = targets.bit_length() - 1
+                targets ^= 1 << endSq
+            captured = squares[endSq]
+            if captured != EMPTY:
+                self.captureCount += 1
+            moves[moveCount] = base | endSq << 6 | captured << 16
+            moveCount += 1
+        return moveCount
+
+    def addSlidingCodes(self, sq, rays, moves, moveCount):
+        """Adds moves along each ray, stopping at the first blocker (captured if it is an enemy)."""
+        occupied = self.colorBitboards['w'] | self.colorBitboards['b']
+        allies = self.colorBitboards['w' if self.whiteToMove else 'b']
+        for directionRays, ascending in rays:
+            ray = directionRays[sq]
+            blockers = ray & occupied
+            if blockers:
+                # The nearest blocker is the lowest set bit when walking up, the highest when walking down
+                blocker = (blockers & -blockers).bit_length() - 1 if ascending else blockers.bit_length() - 1
+                ray ^= directionRays[blocker]
+            moveCount = self.addTargetCodes(sq, ray & ~allies, moves, moveCount, ascending)
+        return moveCount
+
+    def addPawnCodes(self, sq, moves, moveCount):
+        occupied = self.colorBitboards['w'] | self.colorBitboards['b']
+        base = sq | self.squares[sq] << 12 | EMPTY << 16
+        r = sq >> 3
+        if self.whiteToMove:
+            if r - 1 >= 0 and not occupied >> (sq - 8) & 1:  # Move forward
+                moves[moveCount] = base | (sq - 8) << 6
+                moveCount += 1
+                if r == 6 and not occupied >> (sq - 16) & 1:  # Double move
+                    moves[moveCount] = base | (sq - 16) << 6
+                    moveCount += 1
+        else:
+            if r + 1 < 8 and not occupied >> (sq + 8) & 1:  # Move forward
+                moves[moveCount] = base | (sq + 8) << 6
+                moveCount += 1
+                if r == 1 and not occupied >> (sq + 16) & 1:  # Double move
+                    moves[moveCount] = base | (sq + 16) << 6
+                    moveCount += 1
+        return moveCount
+
+    def addRookCodes(self, sq, moves, moveCount):
+        return self.addSlidingCodes(sq, ROOK_RAYS, moves, moveCount)
+
+    def addKnightCodes(self, sq, moves, moveCount):
+        allies = self.colorBitboards['w' if self.whiteToMove else 'b']
+        return self.addTargetCodes(sq, KNIGHT_ATTACKS[sq] & ~allies, moves, moveCount)
+
+    def addBishopCodes(self, sq, moves, moveCount):
+        return self.addSlidingCodes(sq, BISHOP_RAYS, moves, moveCount)
+
+    def addQueenCodes(self, sq, moves, moveCount):
+        moveCount = self.addRookCodes(sq, moves, moveCount)
+        return self.addBishopCodes(sq, moves, moveCount)
+
+    def addKingCodes(self, sq, moves, moveCount):
+        allies = self.colorBitboards['w' if self.whiteToMove else 'b']
+        return self.addTargetCodes(sq, KING_ATTACKS[sq] & ~allies, moves, moveCount)
 
     def addPieceMoves(self, r, c, moves):
         """Adds moves for a specific piece."""
-        piece = self.board[r][c][1]
-        if piece == 'p':
-            self.getPawnMoves(r, c, moves)
-        elif piece == 'R':
-            self.getRookMoves(r, c, moves)
-        elif piece == 'N':
-            self.getKnightMoves(r, c, moves)
-        elif piece == 'B':
-            self.getBishopMoves(r, c, moves)
-        elif piece == 'Q':
-            self.getQueenMoves(r, c, moves)
-        elif piece == 'K':
-            self.getKingMoves(r, c, moves)
+        self.appendMoves(self.addPieceCodes, r, c, moves)
+
+    def appendMoves(self, addCodes, r, c, moves):
+        """Runs one of the code generators for the piece on (r, c) and appends the results as Move objects."""
+        codes = [0] * MAX_MOVES
+        moveCount = addCodes(r * 8 + c, codes, 0)
+        moves.extend(Move.fromCode(code) for code in codes[:moveCount])
 
     def getPawnMoves(self, r, c, moves):
-        if self.whiteToMove:
-            if r - 1 >= 0 and self.board[r - 1][c] == "--":  # Move forward
-                moves.append(Move((r, c), (r - 1, c), self.board))
-            if r == 6 and self.board[r - 1][c] == "--" and self.board[r - 2][c] == "--":  # Double move
-                moves.append(Move((r, c), (r - 2, c), self.board))
-        else:
-            if r + 1 < 8 and self.board[r + 1][c] == "--":  # Move forward
-                moves.append(Move((r, c), (r + 1, c), self.board))
-            if r == 1 and self.board[r + 1][c] == "--" and self.board[r + 2][c] == "--":  # Double move
-                moves.append(Move((r, c), (r + 2, c), self.board))
+        self.appendMoves(self.addPawnCodes, r, c, moves)
 
     def getRookMoves(self, r, c, moves):
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        enemyColor = 'b' if self.whiteToMove else 'w'
-        for d in directions:
-            for i in range(1, 8):
-                endRow, endCol = r + d[0] * i, c + d[1] * i
-                if 0 <= endRow < 8 and 0 <= endCol < 8:
-                    endPiece = self.board[endRow][endCol]
-                    if endPiece == "--":
-                        moves.append(Move((r, c), (endRow, endCol), self.board))
-                    elif endPiece[0] == enemyColor:
-                        moves.append(Move((r, c), (endRow, endCol), self.board))
-                        break
-                    else:
-                        break
-                else:
-                    break
+        self.appendMoves(self.addRookCodes, r, c, moves)
 
     def getKnightMoves(self, r, c, moves):
-        knightMoves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-        allyColor = 'w' if self.whiteToMove else 'b'
-        for m in knightMoves:
-            endRow, endCol = r + m[0], c + m[1]
-            if 0 <= endRow < 8 and 0 <= endCol < 8:
-                endPiece = self.board[endRow][endCol]
-                if endPiece == "--" or endPiece[0] != allyColor:
-                    moves.append(Move((r, c), (endRow, endCol), self.board))
+        self.appendMoves(self.addKnightCodes, r, c, moves)
 
     def getBishopMoves(self, r, c, moves):
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        enemyColor = 'b' if self.whiteToMove else 'w'
-        for d in directions:
-            for i in range(1, 8):
-                endRow, endCol = r + d[0] * i, c + d[1] * i
-                if 0 <= endRow < 8 and 0 <= endCol < 8:
-                    endPiece = self.board[endRow][endCol]
-                    if endPiece == "--":
-                        moves.append(Move((r, c), (endRow, endCol), self.board))
-                    elif endPiece[0] == enemyColor:
-                        moves.append(Move((r, c), (endRow, endCol), self.board))
-                        break
-                    else:
-                        break
-                else:
-                    break
+        self.appendMoves(self.addBishopCodes, r, c, moves)
 
     def getQueenMoves(self, r, c, moves):
-        self.getRookMoves(r, c, moves)
-        self.getBishopMoves(r, c, moves)
+        self.appendMoves(self.addQueenCodes, r, c, moves)
 
     def getKingMoves(self, r, c, moves):
-        kingMoves = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-        allyColor = 'w' if self.whiteToMove else 'b'
-        for m in kingMoves:
-            endRow, endCol = r + m[0], c + m[1]
-            if 0 <= endRow < 8 and 0 <= endCol < 8:
-                endPiece = self.board[endRow][endCol]
-                if endPiece == "--" or endPiece[0] != allyColor:
-                    moves.append(Move((r, c), (endRow, endCol), self.board))
+        self.appendMoves(self.addKingCodes, r, c, moves)
+
+
+def searchRootMove(state, move, depth, maximizingPlayer, bound):
+    """Searches a single root move against the bound of the current top N.
+
+    Returns (evaluation, exact); when exact is False the move cannot beat the bound and the
+    evaluation is only an upper (lower for black) bound on its score.
+    """
+    state.makeMove(move)
+    if maximizingPlayer:
+        alpha, beta = bound, float('inf')
+    else:
+        alpha, beta = float('-inf'), bound
+    evaluation = state.minimax(depth - 1, alpha, beta, not maximizingPlayer)
+    exact = True
+    if evaluation == bound:
+        # A fail-soft score equal to the bound may still tie it, so look at the exact value
+        evaluation = state.minimax(depth - 1, float('-inf'), float('inf'), not maximizingPlayer)
+    elif evaluation < bound if maximizingPlayer else evaluation > bound:
+        exact = False
+    state.undoMove()
+    return evaluation, exact
+
+
+# Per-process state of the root-move pool, set up once by initRootWorker
+workerState = None
+workerBound = None
+
+
+def initRootWorker(board, whiteToMove, sharedBound, options):
+    """Pool initializer: gives every worker its own GameState copy of the root position.
+
+    options are the GameState constructor arguments of the caller, so workers evaluate
+    positions exactly like the sequential search does.
+    """
+    global workerState, workerBound
+    workerState = GameState(**options)
+    workerState.setBoard(board, whiteToMove)
+    workerBound = sharedBound
+
+
+def rootMoveTask(task):
+    index, code, depth, maximizingPlayer = task
+    move = Move.fromCode(code)
+    evaluation, exact = searchRootMove(workerState, move, depth, maximizingPlayer, workerBound.value)
+    return index, evaluation, exact
+
+
+def readPositions(path):
+    """Streams positions from a text file, one FEN per line.
+
+    A line may end with '; depth N' and/or '; time S' to override the batch limits for that
+    position. Blank lines and lines starting with '#' are skipped.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fen, *options = [part.strip() for part in line.split(';')]
+            position = {'fen': fen}
+            for option in options:
+                name, _, value = option.partition(' ')
+                if name == 'depth':
+                    position['depth'] = int(value)
+                elif name == 'time':
+                    position['timeLimit'] = float(value)
+            yield position
+
+
+def analyzePositions(positions, depth=None, timeLimit=None, workers=None, ttSizeMb=16, cachePath=None):
+    """Analyzes a stream of positions on a process pool and yields each result as soon as it is done.
+
+    positions is any iterable (for example readPositions(path)) of FEN strings or dicts with a
+    'fen' key and optional 'depth'/'timeLimit' overrides. Every position is searched by
+    iterative deepening up to its depth and/or time limit (depth 3 if neither is given). Results
+    are dicts in completion order and carry the 'index' of their position. Only a few positions
+    per worker are in flight at once, so the input is never loaded into memory as a whole.
+    With cachePath, every worker maps the same PersistentCache file; the caller creates it and
+    starts the session once, before any worker opens it.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    def tasks():
+        for index, position in enumerate(positions):
+            if isinstance(position, str):
+                position = {'fen': position}
+            yield (index, position['fen'], position.get('depth', depth), position.get('timeLimit', timeLimit))
+
+    cache = PersistentCache(cachePath) if cachePath else None
+    try:
+        if workers == 1:
+            # A local state keeps the caller's process free of the pool's module-level workerState
+            state = GameState(ttSizeMb, persistentCache=cache)
+            for task in tasks():
+                yield analyzePosition(state, task)
+        else:
+            yield from analyzePositionsInPool(tasks(), workers, ttSizeMb, cachePath)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def analyzePositionsInPool(tasks, workers, ttSizeMb, cachePath):
+    """Pool side of analyzePositions: keeps at most workers * 4 tasks in flight."""
+    finished = queue.Queue()
+
+    def nextResult():
+        # Failures inside the pool (e.g. a result that cannot be pickled) arrive as exceptions
+        result = finished.get()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    maxInFlight = workers * 4
+    inFlight = 0
+    with multiprocessing.Pool(workers, initializer=initBatchWorker, initargs=(ttSizeMb, cachePath)) as pool:
+        for task in tasks:
+            pool.apply_async(analyzePositionTask, (task,), callback=finished.put, error_callback=finished.put)
+            inFlight += 1
+            while inFlight >= maxInFlight:
+                yield nextResult()
+                inFlight -= 1
+        while inFlight:
+            yield nextResult()
+            inFlight -= 1
+
+
+def initBatchWorker(ttSizeMb, cachePath=None):
+    """Pool initializer for analyzePositions: one GameState per worker, reused for every position."""
+    global workerState
+    cache = PersistentCache(cachePath, newSession=False) if cachePath else None
+    workerState = GameState(ttSizeMb, persistentCache=cache)
+
+
+def analyzePositionTask(task):
+    return analyzePosition(workerState, task)
+
+
+def analyzePosition(state, task):
+    """Searches one (index, fen, depth, timeLimit) task on state and returns its result dict."""
+    index, fen, depth, timeLimit = task
+    try:
+        state.loadFen(fen)
+        if depth is None and timeLimit is None:
+            depth = 3
+        result = state.iterativeDeepening(timeLimit if timeLimit is not None else float('inf'),
+                                                maxDepth=depth if depth is not None else 64)
+    except Exception as e:
+        # Bad positions are reported in the stream instead of stopping the whole batch
+        return {'index': index, 'fen': fen, 'error': str(e)}
+    return {
+        'index': index,
+        'fen': fen,
+        'bestMove': result.bestMove.getChessNotation() if result.bestMove else None,
+        'score': result.score,
+        'depth': result.depth,
+        'nodes': result.nodes,
+        'elapsed': result.elapsed,
+        'principalVariation': [move.getChessNotation() for move in result.principalVariation],
+    }
+
+
+def captureOrderKey(code):
+    """Sort key of a move code: the score of the captured piece, 0 for a quiet move."""
+    return CAPTURE_SCORES[code >> 16 & 15]
+
+
+CAPTURE_SCORES = [GameState.pieceScores[piece[1]] for piece in PIECES] + [0]
+MOVE_ID_MASK = 0xFFF  # Start and end square bits of a move code
+
+
+class MoveOrdering():
+    """Orders the move codes of a node before minimax searches them.
+
+    This base strategy keeps the original order: captures of the most valuable pieces first,
+    with the transposition table's move in front. Subclasses plug in other heuristics; pass
+    one to GameState(moveOrdering=...) to compare strategies.
+    """
+
+    def orderMoves(self, state, moves, moveCount, hashMoveID):
+        """Reorders moves[:moveCount] in place; hashMoveID is the table's best move or None."""
+        if state.captureCount:
+            moves[:moveCount] = sorted(moves[:moveCount], key=captureOrderKey, reverse=True)
+        if hashMoveID is not None:
+            self.moveToFront(moves, moveCount, hashMoveID)
+
+    def recordCutoff(self, state, code, depth):
+        """Called with the move that caused a beta cutoff at the given remaining depth."""
+
+    def newSearch(self):
+        """Called at the start of every root search."""
+
+    def moveToFront(self, moves, moveCount, moveID):
+        """Moves the code with the given moveID to the start of the first moveCount codes, if present."""
+        for i in range(moveCount):
+            if moves[i] & MOVE_ID_MASK == moveID:
+                if i:
+                    moves.insert(0, moves.pop(i))
+                return
+
+
+class HeuristicMoveOrdering(MoveOrdering):
+    """Hash move, then captures by MVV-LVA, then killer moves, then quiet moves by history score."""
+    HASH_MOVE_SCORE = 1 << 40
+    CAPTURE_SCORE = 1 << 32
+    KILLER_SCORE = 1 << 31
+    HISTORY_LIMIT = 1 << 30  # History scores are halved before they could reach the killer range
+
+    def __init__(self, killerSlots=2):
+        self.killerSlots = killerSlots
+        self.killers = []  # killers[ply] lists the move IDs of recent quiet cutoff moves at that ply
+        self.history = [0] * 4096  # Cutoff credit per move ID (start and end square)
+        # Most valuable victim first, least valuable attacker breaks ties; indexed by code >> 12 & 255
+        ranks = {score: rank for rank, score in enumerate(sorted(set(CAPTURE_SCORES)))}
+        self.captureScores = [0] * 256
+        for moved in range(len(PIECES)):
+            for captured in range(len(PIECES)):
+                victimRank = ranks[CAPTURE_SCORES[captured]]
+                attackerRank = ranks[CAPTURE_SCORES[moved]]
+                self.captureScores[captured << 4 | moved] = self.CAPTURE_SCORE + victimRank * 16 - attackerRank
+        self.hashMoveID = None
+        self.plyKillers = ()
+
+    def orderMoves(self, state, moves, moveCount, hashMoveID):
+        ply = len(state.moveLog)
+        self.hashMoveID = hashMoveID
+        self.plyKillers = self.killers[ply] if ply < len(self.killers) else ()
+        moves[:moveCount] = sorted(moves[:moveCount], key=self.scoreMove, reverse=True)
+
+    def scoreMove(self, code):
+        moveID = code & MOVE_ID_MASK
+        if moveID == self.hashMoveID:
+            return self.HASH_MOVE_SCORE
+        if code >> 16 & 15 != EMPTY:
+            return self.captureScores[code >> 12 & 255]
+        if moveID in self.plyKillers:
+            return self.KILLER_SCORE + self.killerSlots - self.plyKillers.index(moveID)
+        return self.history[moveID]
+
+    def recordCutoff(self, state, code, depth):
+        if code >> 16 & 15 != EMPTY:
+            return  # Captures are already ordered well by MVV-LVA
+        moveID = code & MOVE_ID_MASK
+        ply = len(state.moveLog)
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if moveID not in killers:
+            killers.insert(0, moveID)
+            del killers[self.killerSlots:]
+        self.history[moveID] += depth * depth
+        if self.history[moveID] >= self.HISTORY_LIMIT:
+            self.history = [score // 2 for score in self.history]
+
+    def newSearch(self):
+        """Forgets killers and ages the history so older searches weigh less."""
+        self.killers = []
+        self.history = [score // 2 for score in self.history]
 
 
 class Move():
+    """A move packed into a single int.
+
+    Bits 0-5 hold the start square, 6-11 the end square (both row * 8 + col), 12-15 the moved
+    piece and 16-19 the captured piece (indices into PIECE_NAMES). The old attributes are
+    decoded on access, so a Move costs one slot instead of a per-instance __dict__.
+    """
+    __slots__ = ('code',)
     ranksToRows = {"1": 7, "2": 6, "3": 5, "4": 4, "5": 3, "6": 2, "7": 1, "8": 0}
     rowsToRanks = {v: k for k, v in ranksToRows.items()}
     filesToCols = {"a": 0, "b": 1, "c": 2, "d": 3, "e": 4, "f": 5, "g": 6, "h": 7}
     colsToFiles = {v: k for k, v in filesToCols.items()}
 
     def __init__(self, startSq, endSq, board):
-        self.startRow = startSq[0]
-        self.startCol = startSq[1]
-        self.endRow = endSq[0]
-        self.endCol = endSq[1]
-        self.pieceMoved = board[self.startRow][self.startCol]
-        self.pieceCaptured = board[self.endRow][self.endCol]
+        startRow, startCol = startSq
+        endRow, endCol = endSq
+        self.code = (startRow * 8 + startCol | (endRow * 8 + endCol) << 6
+                     | PIECE_INDEX[board[startRow][startCol]] << 12 | PIECE_INDEX[board[endRow][endCol]] << 16)
+
+    @classmethod
+    def fromCode(cls, code):
+        move = cls.__new__(cls)
+        move.code = code
+        return move
+
+    @property
+    def startRow(self):
+        return (self.code & 63) >> 3
+
+    @property
+    def startCol(self):
+        return self.code & 7
+
+    @property
+    def endRow(self):
+        return (self.code >> 9) & 7
+
+    @property
+    def endCol(self):
+        return (self.code >> 6) & 7
+
+    @property
+    def pieceMoved(self):
+        return PIECE_NAMES[self.code >> 12 & 15]
+
+    @property
+    def pieceCaptured(self):
+        return PIECE_NAMES[self.code >> 16 & 15]
+
+    @property
+    def moveID(self):
+        return self.code & MOVE_ID_MASK
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.code == other.code
+
+    def __hash__(self):
+        return self.code
 
     def getChessNotation(self):
         return self.getRankFile(self.startRow, self.startCol) + self.getRankFile(self.endRow, self.endCol)
@@ -283,12 +1375,9 @@ if __name__ == "__main__":
 
     validMoves = gs.getValidMoves()
     if validMoves:
-        moveEvaluations = []
-        for move in validMoves:
-            gs.makeMove(move)
-            evaluation = gs.minimax(depth=3, alpha=float('-inf'), beta=float('inf'), maximizingPlayer=False)
-            moveEvaluations.append((move, evaluation))
-            gs.undoMove()
+        # Every root move is searched 3 plies deep, spread over all CPU cores
+        moveEvaluations = gs.analyzeRootMoves(depth=4, workers=os.cpu_count())
+        for move, evaluation in moveEvaluations:
             print(f"Move {move.getChessNotation()}: Evaluation = {evaluation:.2f}")
 
         # Sort moves by evaluation to find the top 3 moves
@@ -302,6 +1391,12 @@ if __name__ == "__main__":
             print("Board after move:")
             gs.printBoard()
             gs.undoMove()
+
+        # Time-bounded search: deepen until the budget runs out
+        result = gs.iterativeDeepening(timeLimit=2.0)
+        print(f"Iterative deepening (2s): {result.bestMove.getChessNotation()} "
+              f"(Evaluation = {result.score:.2f}, depth {result.depth}, {result.nodes} nodes, {result.elapsed:.2f}s)")
+        print("Principal variation:", " ".join(move.getChessNotation() for move in result.principalVariation))
     else:
         print("No valid moves available. Game over or invalid state.")
 